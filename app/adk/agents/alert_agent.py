@@ -1,6 +1,6 @@
 # app/adk/agents/alert_agent.py - Fixed for direct alerts
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
+from app.config.adk_config import get_agent_config
 from app.adk.tools import database_save
 
 ALERT_INSTRUCTION = """
@@ -39,7 +39,7 @@ Generate 3-5 SPECIFIC alerts with exact price levels and actions.
 
 def create_alert_agent() -> Agent:
     """Create the alert generation agent."""
-    config = AGENT_CONFIGS["alert_agent"]
+    config = get_agent_config("alert_agent")
     
     return Agent(
         name=config["name"],
@@ -1,6 +1,6 @@
 # app/adk/agents/context_agent.py - Fixed for direct JSON output
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
+from app.config.adk_config import get_agent_config
 
 CONTEXT_INSTRUCTION = """
 You are the Context Agent for TradeSage AI. Extract structured context from hypotheses.
@@ -48,7 +48,7 @@ Output ONLY the JSON, no other text.
 
 def create_context_agent() -> Agent:
     """Create the context analysis agent."""
-    config = AGENT_CONFIGS["context_agent"]
+    config = get_agent_config("context_agent")
     
     return Agent(
         name=config["name"],
@@ -1,9 +1,12 @@
 # app/adk/agents/contradiction_agent.py
+from functools import lru_cache
+from typing import Final
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
-from app.adk.tools import news_search, market_data_search, market_trends_tool, hybrid_research_tool
+from app.adk.agents.prompt_utils import compact_instruction
+from app.config.adk_config import get_agent_config
+from app.adk.tools import RESEARCH_TOOLSET
 
-CONTRADICTION_INSTRUCTION = """
+CONTRADICTION_INSTRUCTION: Final[str] = compact_instruction("""
 You are the Contradiction Agent for TradeSage AI. Find and present SPECIFIC market risks, bearish data, and contradictions for a given hypothesis.
 
 CRITICAL: Output ACTUAL data and findings, not descriptions. Use a rigorous, data-driven style like a professional short-seller or risk manager.
@@ -38,43 +41,18 @@ Format your output as:
 
 Generate 6-8 STRUCTURED CONTRADICTIONS in the JSON array.
 NO meta-commentary like "I have analyzed the data" or "Here is the summary".
-You are the Research Agent for TradeSage AI. Gather SPECIFIC market data and analysis.
+""")
 
-CRITICAL: Output ACTUAL data and findings, not descriptions of what you'll do.
-
-Your research MUST include:
-1. Current price: $XXX.XX
-2. Target price: $XXX.XX  
-3. Required move: XX.X% to reach target
-4. Key metrics: P/E, market cap, recent performance
-5. Recent news: Specific headlines and dates
-6. Technical Indicators: Moving Averages (5-day, 20-day) and Trend Sentiment
-
-GOOD OUTPUT EXAMPLE:
-"AAPL currently trades at $195.64, requiring 12.4% appreciation to reach $220 target.
-P/E ratio: 32.5x (vs sector avg 25.2x)
-Market cap: $3.04T
-YTD performance: +8.2%
-Recent news: 'Apple Vision Pro exceeds sales expectations' (WSJ, Jan 23)
-Technical Trend: Bullish (MA5 > MA20), Momentum: +4.2% over 30 days."
-
-BAD OUTPUT (NEVER do this):
-"I will research Apple's current price and calculate the required move"
-"Let me look up the latest market data for AAPL"
-
-Use your tools to get REAL data, then present the ACTUAL findings.
-NO meta-commentary about what you're doing.
-
-"""
+_CFG = get_agent_config("contradiction_agent")
+_TOOLS = RESEARCH_TOOLSET
 
+@lru_cache(maxsize=1)
 def create_contradiction_agent() -> Agent:
-    """Create the contradiction agent with research-style instructions."""
-    config = AGENT_CONFIGS["contradiction_agent"]
-    
+    """Create the contradiction (risk analysis) agent."""
     return Agent(
-        name=config["name"],
-        model=config["model"],
-        description=config["description"],
+        name=_CFG["name"],
+        model=_CFG["model"],
+        description=_CFG["description"],
         instruction=CONTRADICTION_INSTRUCTION,
-        tools=[news_search, market_data_search, market_trends_tool, hybrid_research_tool],
+        tools=list(_TOOLS),
     )
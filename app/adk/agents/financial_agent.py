@@ -1,9 +1,12 @@
 # app/adk/agents/financial_agent.py
+from functools import lru_cache
+from typing import Final
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
-from app.adk.tools import market_data_search, news_search, market_trends_tool, hybrid_research_tool
+from app.adk.agents.prompt_utils import compact_instruction
+from app.config.adk_config import get_agent_config
+from app.adk.tools import RESEARCH_TOOLSET
 
-FINANCIAL_AGENT_INSTRUCTION = """
+FINANCIAL_AGENT_INSTRUCTION: Final[str] = compact_instruction("""
 You are TradeSage, a quantitative financial analyst. Respond with precision, rigor, and density.
 
 OUTPUT FORMAT — STRICT:
@@ -33,21 +36,18 @@ TONE AND DEPTH:
 - If tools return no news, state "News flow: Nil (7-day window)" — do not editorialize
 - If data is missing, state exactly what is missing and why it matters
 - Conclusions must be falsifiable: "Bullish above [level], thesis invalidated below [level]"
-"""
+""")
 
+_CFG = get_agent_config("financial_agent")
+_TOOLS = RESEARCH_TOOLSET
+
+@lru_cache(maxsize=1)
 def create_financial_agent() -> Agent:
     """Create the financial expert agent for the chatbot."""
-    config = AGENT_CONFIGS.get("financial_agent", {
-        "name": "financial_expert",
-        "description": "Expert financial advisor providing deep analysis and chat capabilities",
-        "model": "gemini-2.0-flash",
-        "temperature": 0.2,
-    })
-    
     return Agent(
-        name=config["name"],
-        model=config["model"],
-        description=config["description"],
+        name=_CFG["name"],
+        model=_CFG["model"],
+        description=_CFG["description"],
         instruction=FINANCIAL_AGENT_INSTRUCTION,
-        tools=[market_data_search, news_search, market_trends_tool, hybrid_research_tool],
+        tools=list(_TOOLS),
     )
@@ -1,11 +1,17 @@
 # app/adk/agents/hypothesis_agent.py - Fixed for direct output
+from functools import lru_cache
+from typing import Final
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
+from app.adk.agents.prompt_utils import compact_instruction
+from app.config.adk_config import get_agent_config
 
-HYPOTHESIS_INSTRUCTION = """
-You are the TradeSage Generate Agent. Your job is to understand sector and market opportunity queries and return structured, actionable investment opportunities.
+# The simulated "today" is sent with each user message rather than baked into
+# the instruction, so the system prompt stays byte-identical across calls and
+# remains eligible for Gemini's implicit prefix caching.
+HYPOTHESIS_CURRENT_DATE: Final[str] = "February 22, 2026"
 
-CURRENT DATE: February 22, 2026.
+HYPOTHESIS_INSTRUCTION: Final[str] = compact_instruction("""
+You are the TradeSage Generate Agent. Your job is to understand sector and market opportunity queries and return structured, actionable investment opportunities.
 
 YOU HANDLE TWO TYPES OF INPUTS:
 
@@ -52,16 +58,18 @@ RULES:
 - No filler like "Great query!" or "Sure, let me analyze".
 - Base picks on real, known companies in the stated sector. Use correct ticker symbols.
 - Conviction levels: High = strong fundamentals + catalyst, Medium = good but uncertain, Speculative = high risk/reward
-"""
+""")
+
+_CFG = get_agent_config("hypothesis_agent")
+_TOOLS = ()
 
+@lru_cache(maxsize=1)
 def create_hypothesis_agent() -> Agent:
     """Create the hypothesis processing agent."""
-    config = AGENT_CONFIGS["hypothesis_agent"]
-    
     return Agent(
-        name=config["name"],
-        model=config["model"],
-        description=config["description"],
+        name=_CFG["name"],
+        model=_CFG["model"],
+        description=_CFG["description"],
         instruction=HYPOTHESIS_INSTRUCTION,
-        tools=[],
+        tools=list(_TOOLS),
     )
@@ -0,0 +1,17 @@
+# app/adk/agents/prompt_utils.py - Helpers for static agent instructions
+import re
+import textwrap
+
+_TRAILING_WS = re.compile(r"[ \t]+\n")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+def compact_instruction(text: str) -> str:
+    """Strip indentation, trailing spaces and blank-line runs from a prompt.
+
+    Called once at import so the resulting string is still a stable prefix
+    for Gemini's implicit caching.
+    """
+    text = textwrap.dedent(text)
+    text = _TRAILING_WS.sub("\n", text)
+    text = _BLANK_RUNS.sub("\n\n", text)
+    return text.strip() + "\n"
@@ -1,9 +1,12 @@
 # app/adk/agents/research_agent.py - Fixed for specific output
+from functools import lru_cache
+from typing import Final
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
-from app.adk.tools import market_data_search, news_search, market_trends_tool, hybrid_research_tool
+from app.adk.agents.prompt_utils import compact_instruction
+from app.config.adk_config import get_agent_config
+from app.adk.tools import RESEARCH_TOOLSET
 
-RESEARCH_INSTRUCTION = """
+RESEARCH_INSTRUCTION: Final[str] = compact_instruction("""
 You are the Research Agent for TradeSage AI. Gather SPECIFIC market data and analysis.
 
 CRITICAL: Output ACTUAL data and findings, not descriptions of what you'll do.
@@ -30,16 +33,18 @@ BAD OUTPUT (NEVER do this):
 
 Use your tools to get REAL data, then present the ACTUAL findings.
 NO meta-commentary about what you're doing.
-"""
+""")
 
+_CFG = get_agent_config("research_agent")
+_TOOLS = RESEARCH_TOOLSET
+
+@lru_cache(maxsize=1)
 def create_research_agent() -> Agent:
     """Create the market research agent."""
-    config = AGENT_CONFIGS["research_agent"]
-    
     return Agent(
-        name=config["name"],
-        model=config["model"],
-        description=config["description"], 
+        name=_CFG["name"],
+        model=_CFG["model"],
+        description=_CFG["description"],
         instruction=RESEARCH_INSTRUCTION,
-        tools=[market_data_search, news_search, market_trends_tool, hybrid_research_tool],
+        tools=list(_TOOLS),
     )
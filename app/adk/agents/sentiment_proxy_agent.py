@@ -1,9 +1,12 @@
 # app/adk/agents/sentiment_proxy_agent.py
+from functools import lru_cache
+from typing import Final
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
-from app.adk.tools import sentiment_search_tool, smart_money_tool
+from app.adk.agents.prompt_utils import compact_instruction
+from app.config.adk_config import get_agent_config
+from app.adk.tools import sentiment_search_tool_async, smart_money_tool_async, smart_money_batch_tool_async
 
-SENTIMENT_INSTRUCTION = """
+SENTIMENT_INSTRUCTION: Final[str] = compact_instruction("""
 You are the Sentiment Proxy Agent for TradeSage AI. Your role is to analyze the divergence or convergence 
 between retail 'dumb money' sentiment and institutional 'smart money' flows.
 
@@ -22,16 +25,18 @@ EXAMPLE OUTPUT:
 However, 'Smart Money' indicators show institutional holders like BlackRock have slightly reduced positions. 
 This divergence suggests a potential near-term 'blow-off top' risk despite the retail hype.
 Sentiment Score: 68 (Retail: 90, Institutional: 45)."
-"""
+""")
 
+_CFG = get_agent_config("sentiment_proxy_agent")
+_TOOLS = (sentiment_search_tool_async, smart_money_tool_async, smart_money_batch_tool_async)
+
+@lru_cache(maxsize=1)
 def create_sentiment_proxy_agent() -> Agent:
     """Create the sentiment proxy agent."""
-    config = AGENT_CONFIGS["sentiment_proxy_agent"]
-    
     return Agent(
-        name=config["name"],
-        model=config["model"],
-        description=config["description"], 
+        name=_CFG["name"],
+        model=_CFG["model"],
+        description=_CFG["description"],
         instruction=SENTIMENT_INSTRUCTION,
-        tools=[sentiment_search_tool, smart_money_tool],
+        tools=list(_TOOLS),
     )
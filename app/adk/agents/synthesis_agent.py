@@ -1,6 +1,6 @@
 # app/adk/agents/synthesis_agent.py - FIXED CONFIRMATIONS
 from google.adk.agents import Agent
-from app.config.adk_config import AGENT_CONFIGS
+from app.config.adk_config import get_agent_config
 
 SYNTHESIS_INSTRUCTION = """
 You are the Synthesis Agent for TradeSage AI. Create comprehensive investment analysis.
@@ -47,7 +47,7 @@ Create a balanced synthesis with:
 
 def create_synthesis_agent() -> Agent:
     """Create the synthesis agent with fixed instructions."""
-    config = AGENT_CONFIGS["synthesis_agent"]
+    config = get_agent_config("synthesis_agent")
     
     return Agent(
         name=config["name"],
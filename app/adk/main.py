@@ -1,74 +1,130 @@
-# Diagnostic prints for Cloud Run debugging
+# Diagnostic logging for Cloud Run debugging
 import os
+import sys
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
-print("--- TradeSage AI Starting Up ---")
-print(f"[LOG] Process PID: {os.getpid()}")
-print(f"[LOG] Current Working Directory: {os.getcwd()}")
+# Log records are handed to a queue and written to stdout by a listener thread,
+# so request handlers never block on stdout I/O.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Attached to the "app" package logger so every app.* module shares the queue;
+# the orchestrator sets the root logger to ERROR to silence SDK noise
+_app_logger = logging.getLogger("app")
+_app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+_app_logger.addHandler(QueueHandler(_log_queue))
+_app_logger.propagate = False
+
+logger = logging.getLogger("app.adk.main")
+
+logger.info("--- TradeSage AI Starting Up ---")
+logger.info("[LOG] Process PID: %s", os.getpid())
+logger.info("[LOG] Current Working Directory: %s", os.getcwd())
 
 # Load environment variables cautiously
 if os.path.exists(".env"):
-    print("[LOG] Found .env file, loading...")
+    logger.info("[LOG] Found .env file, loading...")
     load_dotenv()
 else:
-    print("[LOG] No .env file found, relying on system environment variables.")
+    logger.info("[LOG] No .env file found, relying on system environment variables.")
 
 # Check CRITICAL API keys
-keys_to_check = ["ALPHA_VANTAGE_API_KEY", "FMP_API_KEY", "NEWS_API_KEY", "PROJECT_ID"]
-for key in keys_to_check:
-    val = os.getenv(key)
-    status = "[PRESENT]" if val else "[MISSING]"
-    if val and len(val) > 4:
-        masked = val[:2] + "*" * (len(val)-4) + val[-2:]
-        print(f"[LOG] {key}: {status} ({masked})")
+keys_to_check = ("ALPHA_VANTAGE_API_KEY", "FMP_API_KEY", "NEWS_API_KEY", "PROJECT_ID")
+if os.environ.get("TRADESAGE_DEBUG") == "1":
+    for key in keys_to_check:
+        val = os.getenv(key)
+        status = "[PRESENT]" if val else "[MISSING]"
+        if val and len(val) > 4:
+            masked = val[:2] + "*" * (len(val)-4) + val[-2:]
+            logger.info("[LOG] %s: %s (%s)", key, status, masked)
+        else:
+            logger.info("[LOG] %s: %s", key, status)
+else:
+    missing_keys = [k for k in keys_to_check if not os.environ.get(k)]
+    if missing_keys:
+        logger.warning("[LOG] Missing keys: %s", ", ".join(missing_keys))
     else:
-        print(f"[LOG] {key}: {status}")
+        logger.info("[LOG] All API keys present")
 
 # CRITICAL: Clear stale GCP credentials path if it doesn't exist
 gcp_creds = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 if gcp_creds and not os.path.exists(gcp_creds):
-    print(f"[CLEAN] Clearing invalid GOOGLE_APPLICATION_CREDENTIALS path: {gcp_creds}")
+    logger.info("[CLEAN] Clearing invalid GOOGLE_APPLICATION_CREDENTIALS path: %s", gcp_creds)
     os.environ.pop("GOOGLE_APPLICATION_CREDENTIALS", None)
 
-print("[LOG] Importing orchestrator...")
-try:
-    from app.adk.orchestrator import orchestrator
-    print("[OK] Orchestrator import successful")
-except Exception as e:
-    print(f"[ERROR] CRITICAL ERROR importing orchestrator: {str(e)}")
-    import traceback
-    traceback.print_exc()
-    # Create dummy orchestrator to avoid crash during import by uvicorn
-    orchestrator = None
+# The orchestrator pulls in the full ADK/LLM stack, so it is imported on first
+# use (/process, /chat) rather than at startup
+_orchestrator = None
 
-from fastapi import FastAPI, HTTPException, Depends
+def orchestrator():
+    """Return the ADK orchestrator, importing it on first call."""
+    global _orchestrator
+    if _orchestrator is None:
+        logger.info("[LOG] Importing orchestrator...")
+        try:
+            from app.adk.orchestrator import orchestrator as _orch
+        except Exception as e:
+            logger.exception("[ERROR] CRITICAL ERROR importing orchestrator: %s", e)
+            raise
+        _orchestrator = _orch
+        logger.info("[OK] Orchestrator import successful")
+    return _orchestrator
+
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, List
 import re
+import time
+import binascii
+import orjson
 import os
 from dotenv import load_dotenv
 
-from app.database.database import get_db
+from app.database.database import get_db, init_db, SessionLocal
 from app.database.crud import DashboardCRUD, HypothesisCRUD, ContradictionCRUD, ConfirmationCRUD, AlertCRUD, PriceHistoryCRUD
 from app.utils.text_processor import ResponseProcessor
 
+_TARGET_PRICE_RE = re.compile(r'\$(\d+(?:\.\d+)?)')
+
 def _extract_target_price(thesis: str) -> float:
     """Simple regex to extract target price from thesis statement."""
-    # Look for $ followed by numbers
-    match = re.search(r'\$(\d+(?:\.\d+)?)', thesis)
-    if match:
-        try:
-            return float(match.group(1))
-        except:
-            pass
-    return 0
-
-app = FastAPI(title="TradeSage AI - ADK Version", version="2.0.0")
+    # Look for $ followed by numbers; the pattern always yields a valid float
+    match = _TARGET_PRICE_RE.search(thesis)
+    return float(match.group(1)) if match else 0.0
+
+# Python 3.11+ fromisoformat accepts both "YYYY-MM-DD" and full ISO timestamps,
+# so price-history dates need no strptime fallback
+_parse_ts = datetime.fromisoformat
+
+_ALERT_PRIORITIES = frozenset(("high", "medium", "low"))
+_DEFAULT_INSTRUMENTS = ("SPY",)
+
+def _clip(value: Any, limit: int) -> str:
+    """Coerce an agent-provided value to a string truncated to a column limit, treating None as empty."""
+    if value is None:
+        return ""
+    return (value if isinstance(value, str) else str(value))[:limit]
+
+# Dashboard payload is rebuilt only when stale or after /process writes new data
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "5"))
+_dashboard_cache: Dict[str, Any] = {}
+
+app = FastAPI(
+    title="TradeSage AI - ADK Version",
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # ── Resolve frontend build directory (local dev OR Docker container) ──
 _THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -78,37 +134,93 @@ FRONTEND_BUILD = (
     if os.path.isdir("/app/frontend_build")
     else _local_build                 # Local dev: <project_root>/frontend/build
 )
-print(f"[LOG] Frontend build: {'found' if os.path.isdir(FRONTEND_BUILD) else 'NOT FOUND'} at {FRONTEND_BUILD}")
+# index.html is resolved once; the build directory is fixed for the process lifetime
+_INDEX_PATH = os.path.join(FRONTEND_BUILD, "index.html")
+_INDEX_EXISTS = os.path.isfile(_INDEX_PATH)
+logger.info("[LOG] Frontend build: %s at %s", 'found' if os.path.isdir(FRONTEND_BUILD) else 'NOT FOUND', FRONTEND_BUILD)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000", "*"],
-    allow_credentials=True,
+    # The localhost entries were shadowed by "*" anyway; the frontend sends no cookies
+    allow_origins=["*"],
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def startup_db():
+    """Create tables and warm the DB pool once per worker, outside of import."""
+    init_db()
+
+@app.on_event("startup")
+def startup_market_warmer():
+    """Keep quotes for MARKET_WARM_SYMBOLS (comma-separated) cached in the background.
+
+    Every worker calls this, but only the first to take the host-wide lock warms;
+    the rest read its quotes through the shared disk cache (see start_warmer).
+    """
+    symbols = [s for s in os.getenv("MARKET_WARM_SYMBOLS", "").split(",") if s.strip()]
+    if symbols:
+        from app.services.market_data_service import market_data_service
+        market_data_service.start_warmer(symbols, int(os.getenv("MARKET_WARM_INTERVAL", "45")))
+
+@app.on_event("shutdown")
+def shutdown_market_warmer():
+    if os.getenv("MARKET_WARM_SYMBOLS"):
+        from app.services.market_data_service import market_data_service
+        market_data_service.stop_warmer()
+
 @app.middleware("http")
 async def log_requests(request, call_next):
-    print(f"DEBUG: Incoming {request.method} request to {request.url.path}")
+    logger.debug("Incoming %s request to %s", request.method, request.url.path)
     response = await call_next(request)
-    print(f"DEBUG: Response status: {response.status_code}")
+    logger.debug("Response status: %s", response.status_code)
     return response
 
 @app.get("/")
 async def root():
     """Serve React app if built, otherwise return API info."""
-    index_path = os.path.join(FRONTEND_BUILD, "index.html")
-    if os.path.isfile(index_path):
-        return FileResponse(index_path)
+    if _INDEX_EXISTS:
+        return FileResponse(_INDEX_PATH)
     return {"message": "TradeSage AI - Google ADK v1.0.0 Implementation"}
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "tradesage-ai-adk", "version": "2.0.0"}
 
+def _save_rows(label: str, bulk_create, rows: List[Dict[str, Any]]):
+    """Insert one table's rows on a dedicated session and commit."""
+    db = SessionLocal()
+    try:
+        bulk_create(db, rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning("⚠️  Failed to save %s: %s", label, e)
+        raise
+    finally:
+        db.close()
+
+async def _persist_details(price_rows: List[Dict[str, Any]], contradiction_rows: List[Dict[str, Any]],
+                           confirmation_rows: List[Dict[str, Any]], alert_rows: List[Dict[str, Any]]):
+    """Background task: save the four detail tables concurrently, one pooled connection each."""
+    # The request's session is already closed when background tasks run
+    saves = [
+        ("price history", PriceHistoryCRUD.bulk_create_price_entries, price_rows),
+        ("contradictions", ContradictionCRUD.bulk_create_contradictions, contradiction_rows),
+        ("confirmations", ConfirmationCRUD.bulk_create_confirmations, confirmation_rows),
+        ("alerts", AlertCRUD.bulk_create_alerts, alert_rows),
+    ]
+    # A failed table is logged in _save_rows and does not abort the others
+    await asyncio.gather(
+        *(asyncio.to_thread(_save_rows, label, bulk_create, rows) for label, bulk_create, rows in saves if rows),
+        return_exceptions=True,
+    )
+    _dashboard_cache.clear()
+
 @app.post("/process")
-async def process_hypothesis_adk(request_data: dict, db: Session = Depends(get_db)):
+async def process_hypothesis_adk(request_data: dict, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Process trading hypothesis using ADK agents."""
     
     try:
@@ -119,10 +231,10 @@ async def process_hypothesis_adk(request_data: dict, db: Session = Depends(get_d
         if not hypothesis:
             raise HTTPException(status_code=400, detail="No input text provided (hypothesis, idea, or context)")
         
-        print(f"🚀 Processing with ADK: {hypothesis}")
+        logger.info("🚀 Processing with ADK: %s", hypothesis)
         
         # Process through ADK orchestrator
-        result = await orchestrator.process_hypothesis({
+        result = await orchestrator().process_hypothesis({
             "hypothesis": hypothesis,
             "mode": mode
         })
@@ -138,7 +250,7 @@ async def process_hypothesis_adk(request_data: dict, db: Session = Depends(get_d
         # Extract instruments from context
         instruments = result.get("context", {}).get("asset_info", {}).get("primary_symbol")
         if not instruments:
-            instruments = ["SPY"]
+            instruments = list(_DEFAULT_INSTRUMENTS)
         elif isinstance(instruments, str):
             instruments = [instruments]
             
@@ -154,94 +266,73 @@ async def process_hypothesis_adk(request_data: dict, db: Session = Depends(get_d
             "target_price": _extract_target_price(result.get("processed_hypothesis", ""))
         }
         
-        db_hypothesis = HypothesisCRUD.create_hypothesis(db, hypothesis_data)
+        db_hypothesis = await asyncio.to_thread(HypothesisCRUD.create_hypothesis, db, hypothesis_data)
+        _dashboard_cache.clear()
         
         # Save price history for trend charts
         tool_results = result.get("research_data", {}).get("tool_results", {})
-        print(f"📊 Processing {len(tool_results)} tool results for history...")
+        logger.info("📊 Processing %d tool results for history...", len(tool_results))
+        price_rows = []
         for tool_name, tool_result in tool_results.items():
             if isinstance(tool_result, dict) and 'price_history' in tool_result:
                 symbol = tool_result.get('instrument', 'Unknown')
                 history = tool_result.get('price_history', [])
-                print(f"   📈 Saving {len(history)} price points for {symbol}")
+                logger.info("   📈 Saving %d price points for %s", len(history), symbol)
                 for entry in history:
                     try:
-                        # Convert date string to datetime
-                        date_str = entry["date"]
-                        if 'T' in date_str:
-                            timestamp = datetime.fromisoformat(date_str)
-                        else:
-                            timestamp = datetime.strptime(date_str, "%Y-%m-%d")
-                            
-                        price_data = {
+                        price_rows.append({
                             "hypothesis_id": db_hypothesis.id,
                             "symbol": symbol,
                             "price": entry["price"],
                             "volume": entry["volume"],
-                            "timestamp": timestamp
-                        }
-                        PriceHistoryCRUD.create_price_entry(db, price_data)
+                            "timestamp": _parse_ts(entry["date"])
+                        })
                     except Exception as e:
-                        print(f"      ⚠️  Failed to save price history entry: {str(e)}")
+                        logger.warning("      ⚠️  Skipping invalid price history entry: %s", e)
             else:
-                print(f"   ℹ️  Tool result for {tool_name} does not contain price_history")
+                logger.debug("   ℹ️  Tool result for %s does not contain price_history", tool_name)
         
-        # Save contradictions with validation
-        cleaned_contradictions = []
-        for contradiction in result.get("contradictions", []):
-            if isinstance(contradiction, dict):
-                try:
-                    # Ensure database field limits
-                    contradiction_data = {
-                        "hypothesis_id": db_hypothesis.id,
-                        "quote": contradiction.get("quote", "")[:500],
-                        "reason": contradiction.get("reason", "Market analysis challenges this thesis")[:500],
-                        "source": contradiction.get("source", "Agent Analysis")[:500],
-                        "strength": contradiction.get("strength", "Medium")
-                    }
-                    ContradictionCRUD.create_contradiction(db, contradiction_data)
-                    cleaned_contradictions.append(contradiction.get("quote", ""))
-                except Exception as e:
-                    print(f"⚠️  Failed to save contradiction: {str(e)}")
-                    continue
-        
-        # Save confirmations with validation
-        cleaned_confirmations = []
-        for confirmation in result.get("confirmations", []):
-            if isinstance(confirmation, dict):
-                try:
-                    # Ensure database field limits
-                    confirmation_data = {
-                        "hypothesis_id": db_hypothesis.id,
-                        "quote": confirmation.get("quote", "")[:500],
-                        "reason": confirmation.get("reason", "Market analysis supports this thesis")[:500],
-                        "source": confirmation.get("source", "Agent Analysis")[:500],
-                        "strength": confirmation.get("strength", "Strong")
-                    }
-                    ConfirmationCRUD.create_confirmation(db, confirmation_data)
-                    cleaned_confirmations.append(confirmation.get("quote", ""))
-                except Exception as e:
-                    print(f"⚠️  Failed to save confirmation: {str(e)}")
-                    continue
+        # Build contradiction/confirmation/alert rows with database field limits
+        hypothesis_id = db_hypothesis.id
+        contradictions = [c for c in result.get("contradictions", []) if isinstance(c, dict)]
+        confirmations = [c for c in result.get("confirmations", []) if isinstance(c, dict)]
+        contradiction_rows = [
+            {
+                "hypothesis_id": hypothesis_id,
+                "quote": _clip(c.get("quote"), 500),
+                "reason": _clip(c.get("reason", "Market analysis challenges this thesis"), 500),
+                "source": _clip(c.get("source", "Agent Analysis"), 500),
+                "strength": _clip(c.get("strength", "Medium"), 50)
+            }
+            for c in contradictions
+        ]
+        confirmation_rows = [
+            {
+                "hypothesis_id": hypothesis_id,
+                "quote": _clip(c.get("quote"), 500),
+                "reason": _clip(c.get("reason", "Market analysis supports this thesis"), 500),
+                "source": _clip(c.get("source", "Agent Analysis"), 500),
+                "strength": _clip(c.get("strength", "Strong"), 50)
+            }
+            for c in confirmations
+        ]
+        cleaned_contradictions = [c.get("quote", "") for c in contradictions]
+        cleaned_confirmations = [c.get("quote", "") for c in confirmations]
+        alert_rows = [
+            {
+                "hypothesis_id": hypothesis_id,
+                "alert_type": _clip(a.get("type", "recommendation"), 50),
+                "message": _clip(a.get("message"), 1000),
+                "priority": priority if isinstance(priority, str) and priority in _ALERT_PRIORITIES else "medium"
+            }
+            for a in result.get("alerts", []) if isinstance(a, dict)
+            for priority in (a.get("priority", "medium"),)
+        ]
         
-        # Save alerts with validation
-        for alert in result.get("alerts", []):
-            if isinstance(alert, dict):
-                try:
-                    alert_data = {
-                        "hypothesis_id": db_hypothesis.id,
-                        "alert_type": alert.get("type", "recommendation")[:50],  # Enforce limit
-                        "message": alert.get("message", "")[:1000],  # Enforce limit (adjust based on your schema)
-                        "priority": alert.get("priority", "medium")
-                    }
-                    # Validate priority
-                    if alert_data["priority"] not in ["high", "medium", "low"]:
-                        alert_data["priority"] = "medium"
-                    
-                    AlertCRUD.create_alert(db, alert_data)
-                except Exception as e:
-                    print(f"⚠️  Failed to save alert: {str(e)}")
-                    continue
+        # Detail rows are written after the response is sent
+        background_tasks.add_task(
+            _persist_details, price_rows, contradiction_rows, confirmation_rows, alert_rows
+        )
         
         # Return response with both contradictions AND confirmations
         return {
@@ -256,65 +347,82 @@ async def process_hypothesis_adk(request_data: dict, db: Session = Depends(get_d
             "synthesis": result.get("synthesis", ""),
             "alerts": result.get("alerts", []),
             "recommendations": result.get("recommendations", ""),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "processing_stats": result.get("processing_stats", {})  # ✅ Added processing stats
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ ADK processing error: {str(e)}")
-        import traceback
-        traceback.print_exc()  # ✅ Better error debugging
+        logger.exception("❌ ADK processing error: %s", e)
         raise HTTPException(status_code=500, detail=f"ADK processing failed: {str(e)}")
 
+def _iter_dashboard(summaries: List[Dict[str, Any]]):
+    """Yield the dashboard envelope one encoded card at a time."""
+    yield b'{"status":"success","data":['
+    for i, summary in enumerate(summaries):
+        if i:
+            yield b","
+        yield orjson.dumps(summary)
+    yield b"]}"
+
 @app.get("/dashboard")
-async def get_dashboard_data_adk(db: Session = Depends(get_db)):
+def get_dashboard_data_adk():
     """Get all hypothesis data for the dashboard - ADK version."""
     try:
-        summaries = DashboardCRUD.get_all_hypotheses_summary(db)
-        
-        # Format for frontend (same as LangGraph version)
-        formatted_summaries = []
-        for summary in summaries:
-            if summary:
-                hypothesis = summary["hypothesis"]
-                formatted_summary = {
-                    "id": hypothesis.id,
-                    "title": hypothesis.title,
-                    "status": hypothesis.status.replace("_", " ").title(),
-                    "contradictions": summary["contradictions_count"],
-                    "confirmations": summary["confirmations_count"],
-                    "confidence": int(hypothesis.confidence_score * 100),
-                    "lastUpdated": hypothesis.updated_at.strftime("%d/%m/%Y %H:%M"),
-                    "trendData": summary["trend_data"],
-                    "contradictions_detail": [
-                        {
-                            "quote": c.quote,
-                            "reason": c.reason,
-                            "source": c.source,
-                            "strength": c.strength
-                        } for c in summary["contradictions_detail"]
-                    ],
-                    "confirmations_detail": [
-                        {
-                            "quote": c.quote,
-                            "reason": c.reason,
-                            "source": c.source,
-                            "strength": c.strength
-                        } for c in summary["confirmations_detail"]
-                    ]
-                }
-                formatted_summaries.append(formatted_summary)
+        # Cache hits never open a session; one is created only to rebuild the payload
+        cached = _dashboard_cache.get("all")
+        if cached and time.monotonic() - cached[0] < DASHBOARD_CACHE_TTL:
+            return StreamingResponse(_iter_dashboard(cached[1]), media_type="application/json")
+
+        db = SessionLocal()
+        try:
+            summaries = DashboardCRUD.get_all_hypotheses_summary(db)
+            
+            # Format for frontend (same as LangGraph version)
+            formatted_summaries = []
+            for summary in summaries:
+                if summary:
+                    hypothesis = summary["hypothesis"]
+                    formatted_summary = {
+                        "id": hypothesis.id,
+                        "title": hypothesis.title,
+                        "status": hypothesis.status.replace("_", " ").title(),
+                        "contradictions": summary["contradictions_count"],
+                        "confirmations": summary["confirmations_count"],
+                        "confidence": int(hypothesis.confidence_score * 100),
+                        "lastUpdated": hypothesis.updated_at.strftime("%d/%m/%Y %H:%M"),
+                        "trendData": summary["trend_data"],
+                        "contradictions_detail": [
+                            {
+                                "quote": c.quote,
+                                "reason": c.reason,
+                                "source": c.source,
+                                "strength": c.strength
+                            } for c in summary["contradictions_detail"]
+                        ],
+                        "confirmations_detail": [
+                            {
+                                "quote": c.quote,
+                                "reason": c.reason,
+                                "source": c.source,
+                                "strength": c.strength
+                            } for c in summary["confirmations_detail"]
+                        ]
+                    }
+                    formatted_summaries.append(formatted_summary)
+        finally:
+            db.close()
         
-        return {"status": "success", "data": formatted_summaries}
+        _dashboard_cache["all"] = (time.monotonic(), formatted_summaries)
+        return StreamingResponse(_iter_dashboard(formatted_summaries), media_type="application/json")
         
     except Exception as e:
-        print(f"❌ Dashboard error: {str(e)}")
+        logger.error("❌ Dashboard error: %s", e)
         raise HTTPException(status_code=500, detail=f"Dashboard error: {str(e)}")
 
 @app.get("/hypothesis/{hypothesis_id}")
-async def get_hypothesis_detail_adk(hypothesis_id: int, db: Session = Depends(get_db)):
+def get_hypothesis_detail_adk(hypothesis_id: int, db: Session = Depends(get_db)):
     """Get detailed hypothesis information - ADK version."""
     try:
         summary = DashboardCRUD.get_hypothesis_summary(db, hypothesis_id)
@@ -328,11 +436,11 @@ async def get_hypothesis_detail_adk(hypothesis_id: int, db: Session = Depends(ge
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error getting hypothesis {hypothesis_id}: {str(e)}")
+        logger.error("❌ Error getting hypothesis %s: %s", hypothesis_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/alerts")
-async def get_alerts_adk(db: Session = Depends(get_db)):
+def get_alerts_adk(db: Session = Depends(get_db)):
     """Get all unread alerts - ADK version."""
     try:
         alerts = AlertCRUD.get_unread_alerts(db)
@@ -344,16 +452,16 @@ async def get_alerts_adk(db: Session = Depends(get_db)):
                     "type": alert.alert_type,
                     "message": alert.message,
                     "priority": alert.priority,
-                    "created_at": alert.created_at.isoformat()
+                    "created_at": alert.created_at
                 } for alert in alerts
             ]
         }
     except Exception as e:
-        print(f"❌ Error getting alerts: {str(e)}")
+        logger.error("❌ Error getting alerts: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.patch("/alerts/{alert_id}/read")
-async def mark_alert_read_adk(alert_id: int, db: Session = Depends(get_db)):
+def mark_alert_read_adk(alert_id: int, db: Session = Depends(get_db)):
     """Mark an alert as read - ADK version."""
     try:
         alert = AlertCRUD.mark_alert_as_read(db, alert_id)
@@ -363,7 +471,7 @@ async def mark_alert_read_adk(alert_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error marking alert {alert_id} as read: {str(e)}")
+        logger.error("❌ Error marking alert %s as read: %s", alert_id, e)
         raise HTTPException(status_code=500, detail=str(e))
         
 @app.post("/chat")
@@ -376,7 +484,7 @@ async def chat_with_agent(request_data: dict):
         if not message:
             raise HTTPException(status_code=400, detail="Missing message")
             
-        result = await orchestrator.chat(message, session_id)
+        result = await orchestrator().chat(message, session_id)
         
         if result.get("status") == "error":
             raise HTTPException(status_code=500, detail=result.get("error"))
@@ -386,7 +494,7 @@ async def chat_with_agent(request_data: dict):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Chat error: {str(e)}")
+        logger.error("❌ Chat error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 CHART_ANALYSIS_PROMPT = """You are a professional quantitative analyst specializing in technical chart analysis. 
@@ -438,67 +546,99 @@ Volatility assessment: Low / Medium / High — based on candle body sizes relati
 
 Be precise. If the chart is unclear or low resolution, state what you can and cannot determine."""
 
+CHART_MODEL_NAME = "gemini-2.0-flash"
+CHART_TIMEOUT = float(os.getenv("CHART_TIMEOUT", "30"))
+
+# Chart-analysis models are built once per worker instead of on every request.
+# Vertex AI (service account auth) is preferred; the API-key client is only a fallback.
+_CHART_MODEL = None
+_CHART_MODEL_FALLBACK = None
+_CHART_PROMPT_PART = None
+_chart_model_error = None
+
+try:
+    import vertexai
+    from vertexai.generative_models import GenerativeModel, Part
+    vertexai.init(
+        project=os.getenv("PROJECT_ID", "sdr-agent-486508"),
+        location=os.getenv("REGION", "us-central1"),
+    )
+    _CHART_MODEL = GenerativeModel(CHART_MODEL_NAME)
+    _CHART_PROMPT_PART = Part.from_text(CHART_ANALYSIS_PROMPT)
+    logger.info("[OK] Chart model initialized via Vertex AI")
+except Exception as e:
+    _chart_model_error = e
+    logger.warning("⚠️ Vertex AI chart model unavailable: %s", e)
+
+if os.getenv("GEMINI_API_KEY"):
+    try:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _CHART_MODEL_FALLBACK = genai.GenerativeModel(CHART_MODEL_NAME)
+    except Exception as e:
+        logger.warning("⚠️ Gemini API-key chart model unavailable: %s", e)
+
 @app.post("/analyze-chart")
 async def analyze_chart(request_data: dict):
     """Analyze a financial chart image using Gemini Vision."""
     try:
-        import base64
-
         image_data = request_data.get("image")
         mime_type = request_data.get("mime_type", "image/png")
 
         if not image_data:
             raise HTTPException(status_code=400, detail="Missing image data")
+        if not isinstance(image_data, str):
+            raise HTTPException(status_code=400, detail="Image data must be a base64 string")
 
-        # Strip data URI prefix if present
-        if "," in image_data:
-            image_data = image_data.split(",", 1)[1]
-
-        image_bytes = base64.b64decode(image_data)
-
-        project_id = os.getenv("PROJECT_ID", "sdr-agent-486508")
-        location = os.getenv("REGION", "us-central1")
-        gemini_api_key = os.getenv("GEMINI_API_KEY", "")
+        # Strip data URI prefix if present. The one ASCII encode is the copy b64decode
+        # would make anyway; a2b_base64 then reads the tail through a memoryview, without
+        # copying it, and like b64decode(validate=False) skips newlines and spaces.
+        try:
+            raw = image_data.encode("ascii")
+            image_bytes = binascii.a2b_base64(memoryview(raw)[raw.find(b",") + 1:])
+        except (binascii.Error, UnicodeEncodeError):
+            raise HTTPException(status_code=400, detail="Invalid base64 image data")
 
         analysis_text = None
+        vertex_err = _chart_model_error
 
         # Path 1: Vertex AI (preferred — Cloud Run uses service account auth)
-        try:
-            import vertexai
-            from vertexai.generative_models import GenerativeModel, Part
-            vertexai.init(project=project_id, location=location)
-            model = GenerativeModel("gemini-2.0-flash")
-            image_part = Part.from_data(data=image_bytes, mime_type=mime_type)
-            response = model.generate_content([CHART_ANALYSIS_PROMPT, image_part])
-            analysis_text = response.text
-            print(f"✅ Chart analysis via Vertex AI ({len(analysis_text)} chars)")
-        except Exception as vertex_err:
-            print(f"⚠️ Vertex AI path failed: {vertex_err}, trying google-generativeai...")
-
-            # Path 2: google.generativeai with API key
-            if not gemini_api_key:
+        if _CHART_MODEL is not None:
+            try:
+                image_part = Part.from_data(data=image_bytes, mime_type=mime_type)
+                response = await asyncio.wait_for(
+                    _CHART_MODEL.generate_content_async([_CHART_PROMPT_PART, image_part]),
+                    timeout=CHART_TIMEOUT,
+                )
+                analysis_text = response.text
+                logger.info("✅ Chart analysis via Vertex AI (%d chars)", len(analysis_text))
+            except Exception as e:
+                vertex_err = e
+                logger.warning("⚠️ Vertex AI path failed: %r, trying google-generativeai...", e)
+
+        # Path 2: google.generativeai with API key
+        if analysis_text is None:
+            if _CHART_MODEL_FALLBACK is None:
                 raise RuntimeError(f"Vertex AI failed and GEMINI_API_KEY not set. Vertex error: {vertex_err}")
 
-            import google.generativeai as genai
-            genai.configure(api_key=gemini_api_key)
-            model = genai.GenerativeModel("gemini-2.0-flash")
             image_part = {"mime_type": mime_type, "data": image_bytes}
-            response = model.generate_content([CHART_ANALYSIS_PROMPT, image_part])
+            response = await asyncio.wait_for(
+                _CHART_MODEL_FALLBACK.generate_content_async([CHART_ANALYSIS_PROMPT, image_part]),
+                timeout=CHART_TIMEOUT,
+            )
             analysis_text = response.text
-            print(f"✅ Chart analysis via Gemini API key ({len(analysis_text)} chars)")
+            logger.info("✅ Chart analysis via Gemini API key (%d chars)", len(analysis_text))
 
         return {
             "status": "success",
             "analysis": analysis_text,
-            "model": "gemini-2.0-flash-vision"
+            "model": f"{CHART_MODEL_NAME}-vision"
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Chart analysis error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Chart analysis error: %s", e)
         raise HTTPException(status_code=500, detail=f"Chart analysis failed: {str(e)}")
 
 
@@ -515,11 +655,10 @@ if os.path.isdir(FRONTEND_BUILD):
     @app.get("/{full_path:path}")
     async def serve_react(full_path: str):
         """Catch-all: serve React index.html for all non-API paths (SPA routing)."""
-        index = os.path.join(FRONTEND_BUILD, "index.html")
-        if os.path.isfile(index):
-            return FileResponse(index)
+        if _INDEX_EXISTS:
+            return FileResponse(_INDEX_PATH)
         return {"message": "Frontend not built"}
 else:
-    print(f"[INFO] Frontend build not found at {FRONTEND_BUILD} — API-only mode")
+    logger.info("[INFO] Frontend build not found at %s — API-only mode", FRONTEND_BUILD)
 
 
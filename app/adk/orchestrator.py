@@ -57,7 +57,7 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
-from app.adk.agents.hypothesis_agent import create_hypothesis_agent
+from app.adk.agents.hypothesis_agent import create_hypothesis_agent, HYPOTHESIS_CURRENT_DATE
 from app.adk.agents.context_agent import create_context_agent
 from app.adk.agents.research_agent import create_research_agent
 from app.adk.agents.contradiction_agent import create_contradiction_agent
@@ -66,7 +66,31 @@ from app.adk.agents.alert_agent import create_alert_agent
 from app.adk.agents.sentiment_proxy_agent import create_sentiment_proxy_agent
 from app.adk.agents.financial_agent import create_financial_agent
 from app.adk.response_handler import ADKResponseHandler
-from app.config.adk_config import ADK_CONFIG
+from app.config.adk_config import ADK_CONFIG, AGENT_CONFIGS
+
+# Orchestrator agent name -> AGENT_CONFIGS key
+AGENT_CONFIG_KEYS = {
+    "hypothesis": "hypothesis_agent",
+    "context": "context_agent",
+    "research": "research_agent",
+    "contradiction": "contradiction_agent",
+    "synthesis": "synthesis_agent",
+    "alert": "alert_agent",
+    "sentiment": "sentiment_proxy_agent",
+    "chat": "financial_agent",
+}
+DEFAULT_AGENT_TIMEOUT = 60.0
+
+# Tools with side effects; agents holding any of them are never re-run after a
+# timeout, since the first attempt may already have written its rows
+WRITE_TOOLS = frozenset(("database_save",))
+
+def _has_write_tools(agent) -> bool:
+    for tool in getattr(agent, "tools", None) or ():
+        name = getattr(tool, "name", None) or getattr(tool, "__name__", None)
+        if name in WRITE_TOOLS:
+            return True
+    return False
 
 class WarningSuppressionContext:
     """Context manager to completely suppress Gemini warnings during operations"""
@@ -355,14 +379,7 @@ class TradeSageOrchestrator:
             # Create session for this agent
             app_name = f"tradesage_{agent_name}"
             user_id = "tradesage_user"
-            session_id = f"session_{agent_name}_{id(input_data)}"
-            
-            # Create session
-            session = await self.session_service.create_session(
-                app_name=app_name,
-                user_id=user_id, 
-                session_id=session_id
-            )
+            base_session_id = f"session_{agent_name}_{id(input_data)}"
             
             # Create runner
             runner = Runner(
@@ -378,61 +395,32 @@ class TradeSageOrchestrator:
                 parts=[types.Part(text=user_message)]
             )
             
-            # COMPLETE WARNING SUPPRESSION: Use context manager
-            with WarningSuppressionContext():
-                # Collect ALL events and parts properly
-                all_events = []
-                text_responses = []
-                function_calls = []
-                function_responses = []
-                tool_results = {}
-                errors = []
+            # Bound each attempt so a hanging Gemini call cannot stall the pipeline
+            config_key = AGENT_CONFIG_KEYS.get(agent_name, "")
+            timeout = AGENT_CONFIGS.get(config_key, {}).get("request_timeout", DEFAULT_AGENT_TIMEOUT)
+            attempts = 1 if _has_write_tools(agent) else ADK_CONFIG.get("agent_attempts", 2)
+            
+            for attempt in range(1, attempts + 1):
+                # Fresh session per attempt so a retry doesn't replay a half-finished turn
+                session_id = base_session_id if attempt == 1 else f"{base_session_id}_retry{attempt}"
+                await self.session_service.create_session(
+                    app_name=app_name,
+                    user_id=user_id, 
+                    session_id=session_id
+                )
                 
-                # Process all events and handle ALL part types
-                async for event in runner.run_async(
-                    user_id=user_id,
-                    session_id=session_id, 
-                    new_message=message
-                ):
-                    all_events.append(event)
-                    
-                    # Handle different event types - process ALL parts to avoid warnings
-                    if hasattr(event, 'content') and event.content:
-                        if hasattr(event.content, 'parts') and event.content.parts:
-                            for part in event.content.parts:
-                                # Handle ALL part types to avoid warnings
-                                
-                                # Handle text parts
-                                if hasattr(part, 'text') and part.text:
-                                    text_responses.append(part.text)
-                                
-                                # Handle function calls (prevents warning about non-text parts)
-                                elif hasattr(part, 'function_call') and part.function_call:
-                                    function_call = {
-                                        "name": part.function_call.name,
-                                        "args": dict(part.function_call.args) if part.function_call.args else {}
-                                    }
-                                    function_calls.append(function_call)
-                                
-                                # Handle function responses (prevents warning about non-text parts)
-                                elif hasattr(part, 'function_response') and part.function_response:
-                                    function_response = {
-                                        "name": part.function_response.name,
-                                        "response": part.function_response.response
-                                    }
-                                    function_responses.append(function_response)
-                                    
-                                    # Store tool results for easy access
-                                    tool_results[part.function_response.name] = part.function_response.response
-                                
-                                # Handle any other part types to prevent warnings
-                                else:
-                                    # This catches any other part types and processes them silently
-                                    pass
-                    
-                    # Handle errors
-                    if hasattr(event, 'error') and event.error:
-                        errors.append(str(event.error))
+                try:
+                    # COMPLETE WARNING SUPPRESSION: Use context manager
+                    with WarningSuppressionContext():
+                        text_responses, function_calls, function_responses, tool_results, errors = await asyncio.wait_for(
+                            self._collect_agent_events(runner, user_id, session_id, message),
+                            timeout=timeout
+                        )
+                    break
+                except asyncio.TimeoutError:
+                    print(f"   [WARN] {agent_name} timed out after {timeout}s (attempt {attempt}/{attempts})")
+                    if attempt == attempts:
+                        raise TimeoutError(f"{agent_name} agent timed out after {attempts} attempts")
             
             # Combine all response parts properly
             final_text = " ".join(text_responses) if text_responses else ""
@@ -484,6 +472,60 @@ class TradeSageOrchestrator:
                 "has_tools": False
             }
 
+    async def _collect_agent_events(self, runner: Runner, user_id: str, session_id: str, message: types.Content):
+        """Run the agent and collect text, tool calls, tool results and errors from its events."""
+        text_responses = []
+        function_calls = []
+        function_responses = []
+        tool_results = {}
+        errors = []
+        
+        # Process all events and handle ALL part types
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id, 
+            new_message=message
+        ):
+            # Handle different event types - process ALL parts to avoid warnings
+            if hasattr(event, 'content') and event.content:
+                if hasattr(event.content, 'parts') and event.content.parts:
+                    for part in event.content.parts:
+                        # Handle ALL part types to avoid warnings
+                        
+                        # Handle text parts
+                        if hasattr(part, 'text') and part.text:
+                            text_responses.append(part.text)
+                        
+                        # Handle function calls (prevents warning about non-text parts)
+                        elif hasattr(part, 'function_call') and part.function_call:
+                            function_call = {
+                                "name": part.function_call.name,
+                                "args": dict(part.function_call.args) if part.function_call.args else {}
+                            }
+                            function_calls.append(function_call)
+                        
+                        # Handle function responses (prevents warning about non-text parts)
+                        elif hasattr(part, 'function_response') and part.function_response:
+                            function_response = {
+                                "name": part.function_response.name,
+                                "response": part.function_response.response
+                            }
+                            function_responses.append(function_response)
+                            
+                            # Store tool results for easy access
+                            tool_results[part.function_response.name] = part.function_response.response
+                        
+                        # Handle any other part types to prevent warnings
+                        else:
+                            # This catches any other part types and processes them silently
+                            pass
+            
+            # Handle errors
+            if hasattr(event, 'error') and event.error:
+                errors.append(str(event.error))
+        
+        return text_responses, function_calls, function_responses, tool_results, errors
+
     def _extract_research_summary_from_tools(self, research_result: Dict) -> str:
         """Extract research summary properly handling tool results"""
         
@@ -901,7 +943,9 @@ Primary risks involve valuation concerns, competitive pressures, and market cond
         
         if agent_name == "hypothesis":
             mode = input_data.get('mode', 'analyze')
-            return f"""Process this trading hypothesis in {mode} mode:
+            return f"""CURRENT DATE: {HYPOTHESIS_CURRENT_DATE}.
+
+Process this trading hypothesis in {mode} mode:
 
 "{base_hypothesis}"
 
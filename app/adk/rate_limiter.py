@@ -0,0 +1,91 @@
+# app/adk/rate_limiter.py - Per-provider pacing for external data calls
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Longest a tool call will queue for a token before it is shed
+MAX_WAIT_SECONDS = float(os.getenv("RATE_LIMIT_MAX_WAIT", "15"))
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call is shed because the provider's budget is exhausted."""
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """Take a token if available; otherwise return seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a token is taken. Returns False if that would exceed `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._try_take()
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Event-loop friendly variant of acquire()."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._try_take()
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+def _per_minute(env_name: str, default: str) -> float:
+    return float(os.getenv(env_name, default)) / 60.0
+
+# Alpha Vantage's free tier allows 5 requests/minute; Yahoo and the market data
+# fallbacks have informal limits well above that
+BUCKETS: Dict[str, TokenBucket] = {
+    "news": TokenBucket(_per_minute("NEWS_RATE_PER_MIN", "5"), burst=5),
+    "market_data": TokenBucket(_per_minute("MARKET_DATA_RATE_PER_MIN", "60"), burst=10),
+    "yfinance": TokenBucket(_per_minute("YFINANCE_RATE_PER_MIN", "60"), burst=10),
+}
+
+def _is_rate_limited(result: Any) -> bool:
+    if isinstance(result, Exception):
+        text = str(result).lower()
+    elif isinstance(result, dict) and result.get("status") == "error":
+        text = str(result.get("error", "")).lower()
+    else:
+        return False
+    return "rate limit" in text or "429" in text or "too many requests" in text
+
+def call_with_backoff(provider: str, fn: Callable, *args, retries: int = 2, base_delay: float = 1.0, **kwargs):
+    """Call fn once the provider's bucket allows it, backing off exponentially on 429s."""
+    bucket = BUCKETS[provider]
+    for attempt in range(retries + 1):
+        if not bucket.acquire(timeout=MAX_WAIT_SECONDS):
+            raise RateLimitExceeded(f"{provider} rate limit reached; request shed")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if not _is_rate_limited(e) or attempt == retries:
+                raise
+        else:
+            if not _is_rate_limited(result) or attempt == retries:
+                return result
+        time.sleep(base_delay * 2 ** attempt)
@@ -1,20 +1,30 @@
 # app/adk/tools.py - Fixed Tools (No Default Parameters)
 from typing import Dict, Any, List
 import json
+import logging
 import os
+import asyncio
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from app.services.market_data_service import get_market_data, market_data_service
-from app.tools.news_data_tool import news_data_tool
+from app.tools.news_data_tool import news_data_tool, configure_session
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive pool for news lookups; sentiment and research bursts reuse connections
+configure_session(pool_connections=16, pool_maxsize=32, keepalive=True)
 
 def market_data_search(instrument: str) -> Dict[str, Any]:
     """Get market data and historical price trends for a financial instrument."""
     try:
-        from app.services.market_data_service import get_market_data, market_data_service
-        
-        # Get current quote
-        result = get_market_data(instrument)
-        
-        # Get history for trend charts (last 30 days)
-        history = market_data_service.get_price_history(instrument, days=30)
+        # Current quote and 30-day history (for trend charts) are fetched in parallel
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            quote_future = executor.submit(get_market_data, instrument)
+            history_future = executor.submit(market_data_service.get_price_history, instrument, 30)
+            result = quote_future.result()
+            history = history_future.result()
         
         return {
             "status": "success",
@@ -63,26 +73,102 @@ def market_trends_tool(instrument: str) -> Dict[str, Any]:
             "instrument": instrument
         }
 
+# Write-behind buffer for database_save. Agents emit contradictions/confirmations
+# in bursts, so rows are flushed together in one transaction every
+# DB_SAVE_FLUSH_INTERVAL seconds, or immediately once DB_SAVE_BATCH_SIZE are pending.
+DB_SAVE_FLUSH_INTERVAL = 0.25
+DB_SAVE_BATCH_SIZE = 50
+_SAVE_COLUMNS = ("quote", "reason", "source", "strength", "url", "sentiment_score")
+_REQUIRED_SAVE_FIELDS = ("quote", "reason")
+
+_pending_saves: Dict[str, List[Dict[str, Any]]] = {"contradiction": [], "confirmation": []}
+_pending_lock = threading.Lock()
+_flush_timer = None
+
+def flush_database_save() -> Dict[str, List[int]]:
+    """Write all buffered database_save rows in a single transaction. Returns the new ids by type."""
+    global _flush_timer
+    with _pending_lock:
+        contradictions = _pending_saves["contradiction"]
+        confirmations = _pending_saves["confirmation"]
+        _pending_saves["contradiction"] = []
+        _pending_saves["confirmation"] = []
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+    
+    if not contradictions and not confirmations:
+        return {"contradiction": [], "confirmation": []}
+    
+    from app.database.database import SessionLocal
+    from app.database.crud import ContradictionCRUD, ConfirmationCRUD
+    
+    inserts = {
+        "contradiction": (ContradictionCRUD.bulk_create_contradictions, contradictions),
+        "confirmation": (ConfirmationCRUD.bulk_create_confirmations, confirmations),
+    }
+    
+    db = SessionLocal()
+    try:
+        try:
+            # Core INSERT ... RETURNING id: no ORM objects, no refresh SELECTs
+            saved = {data_type: insert(db, rows) for data_type, (insert, rows) in inserts.items()}
+            db.commit()
+            return saved
+        except Exception as e:
+            db.rollback()
+            logger.warning(
+                "database_save batch of %d rows failed, retrying row by row: %s",
+                len(contradictions) + len(confirmations), e,
+            )
+        
+        # One bad row (e.g. an unknown hypothesis_id) must not take the rest of the batch with it
+        saved = {"contradiction": [], "confirmation": []}
+        for data_type, (insert, rows) in inserts.items():
+            for row in rows:
+                try:
+                    saved[data_type].extend(insert(db, [row]))
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.error(
+                        "database_save dropped %s for hypothesis %s: %s",
+                        data_type, row.get("hypothesis_id"), e,
+                    )
+        return saved
+    finally:
+        db.close()
+
+atexit.register(flush_database_save)
+
 def database_save(data_type: str, hypothesis_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
     """Save data to the database."""
+    global _flush_timer
     try:
-        from app.database.database import get_db
-        from app.database.crud import ContradictionCRUD, ConfirmationCRUD
+        # Reject unknown types before any buffering or DB work
+        if data_type not in _pending_saves:
+            return {"status": "error", "error": f"unknown data_type {data_type}"}
+        
+        # quote and reason are NOT NULL; reject here, while the agent can still see the error
+        missing = [field for field in _REQUIRED_SAVE_FIELDS if not data.get(field)]
+        if missing:
+            return {"status": "error", "error": f"{data_type} is missing required field(s): {', '.join(missing)}"}
+        
+        # Every row gets the same columns so the batch renders as one multi-row INSERT
+        row = {"hypothesis_id": hypothesis_id, **{column: data.get(column) for column in _SAVE_COLUMNS}}
         
-        db = next(get_db())
+        with _pending_lock:
+            _pending_saves[data_type].append(row)
+            pending = len(_pending_saves["contradiction"]) + len(_pending_saves["confirmation"])
+            if pending < DB_SAVE_BATCH_SIZE and _flush_timer is None:
+                _flush_timer = threading.Timer(DB_SAVE_FLUSH_INTERVAL, flush_database_save)
+                _flush_timer.daemon = True
+                _flush_timer.start()
         
-        if data_type == "contradiction":
-            ContradictionCRUD.create_contradiction(db, {
-                "hypothesis_id": hypothesis_id,
-                **data
-            })
-        elif data_type == "confirmation": 
-            ConfirmationCRUD.create_confirmation(db, {
-                "hypothesis_id": hypothesis_id,
-                **data
-            })
+        if pending >= DB_SAVE_BATCH_SIZE:
+            flush_database_save()
         
-        return {"status": "success", "message": f"Saved {data_type} to database"}
+        return {"status": "success", "message": f"Queued {data_type} for database save"}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
@@ -93,18 +179,14 @@ def sentiment_search_tool(query: str) -> Dict[str, Any]:
         # and looking for 'retail' / 'sentiment' keywords
         project_id = os.getenv("PROJECT_ID", "sdr-agent-486508")
         
-        # Targeted social sentiment queries
-        social_queries = [
-            f"{query} reddit sentiment",
-            f"{query} x twitter sentiment",
-            f"{query} retail investor buzz"
-        ]
-        
-        results = []
-        for q in social_queries:
-            res = news_data_tool(q, days=3, project_id=project_id)
-            if res.get("status") == "success":
-                results.extend(res.get("articles", []))
+        # news_data_tool only searches on the query's leading ticker token, so the
+        # reddit / x twitter / retail-buzz variants all resolved to the same
+        # request. One combined call returns the same articles.
+        res = news_data_tool(
+            f'{query} (reddit OR "x twitter" OR "retail investor") (sentiment OR buzz)',
+            days=3, project_id=project_id
+        )
+        results = res.get("articles", []) if res.get("status") == "success" else []
         
         return {
             "status": "success",
@@ -114,57 +196,109 @@ def sentiment_search_tool(query: str) -> Dict[str, Any]:
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
+def _smart_money_summary(instrument: str, holders: List[Dict[str, Any]], trends: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "status": "success",
+        "institutional_holders": holders,
+        "volume_analysis": trends.get("data", {}),
+        "instrument": instrument,
+        "smart_money_score": 0.7 if trends.get("trend") == "Bullish" else 0.4
+    }
+
 def smart_money_tool(instrument: str) -> Dict[str, Any]:
     """Fetch institutional 'Smart Money' indicators (Ownership, Large Volume Flows)."""
     try:
-        # Use FMP institutional data if available, or yfinance ownership
-        from app.services.market_data_service import market_data_service
-        
         # 1. Try to get institutional holders via yfinance
-        import yfinance as yf
-        ticker = yf.Ticker(instrument)
-        holders = ticker.institutional_holders
-        
-        holdings_summary = []
-        if holders is not None and not holders.empty:
-            for _, row in holders.head(5).iterrows():
-                holdings_summary.append({
-                    "holder": str(row.get('Holder', 'Unknown')),
-                    "shares": int(row.get('Shares', 0)),
-                    "value": float(row.get('Value', 0))
-                })
+        holders = market_data_service.get_institutional_holders(instrument)
         
         # 2. Get volume trends (Institutional activity proxy)
         trends = market_data_service.get_market_trends(instrument)
         
-        return {
-            "status": "success",
-            "institutional_holders": holdings_summary,
-            "volume_analysis": trends.get("data", {}),
-            "instrument": instrument,
-            "smart_money_score": 0.7 if trends.get("trend") == "Bullish" else 0.4
-        }
+        return _smart_money_summary(instrument, holders, trends)
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+def smart_money_batch_tool(instruments: List[str]) -> Dict[str, Any]:
+    """Fetch institutional 'Smart Money' indicators for several instruments in one call."""
+    try:
+        symbols = list(dict.fromkeys(i.upper().strip() for i in instruments if i and i.strip()))
+        if not symbols:
+            return {"status": "error", "error": "No instruments provided"}
+        
+        # Holder lookups are independent per-ticker HTTP calls, so they fan out across
+        # threads. Trends stay sequential: yf.download shares module-level state.
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+            holder_futures = {
+                symbol: executor.submit(market_data_service.get_institutional_holders, symbol)
+                for symbol in symbols
+            }
+            results = {}
+            for symbol in symbols:
+                try:
+                    trends = market_data_service.get_market_trends(symbol)
+                    results[symbol] = _smart_money_summary(symbol, holder_futures[symbol].result(), trends)
+                except Exception as e:
+                    results[symbol] = {"status": "error", "error": str(e), "instrument": symbol}
+        
+        return {"status": "success", "results": results}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
+@lru_cache(maxsize=1)
+def _get_hybrid_research():
+    """Import hybrid_rag_service (Vertex AI, Cloud SQL) only when first needed."""
+    from app.services.hybrid_rag_service import hybrid_research
+    return hybrid_research
+
+_research_loop = None
+_research_loop_lock = threading.Lock()
+
+def _get_research_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) a background event loop thread for async research calls."""
+    global _research_loop
+    with _research_loop_lock:
+        if _research_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="hybrid-research-loop", daemon=True).start()
+            _research_loop = loop
+        return _research_loop
+
 def hybrid_research_tool(hypothesis: str, instruments: List[str]) -> Dict[str, Any]:
     """Perform hybrid research combining internal historical data (RAG) and real-time APIs."""
     try:
-        from app.services.hybrid_rag_service import hybrid_research
-        import asyncio
+        hybrid_research = _get_hybrid_research()
         
-        # Run the async research method in a synchronous wrapper for tool compatibility
-        # Note: In a production FastAPI environment, we should ideally use the async version
-        # but ADK tools are typically sync wrappers.
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(hybrid_research(hypothesis, instruments))
-        loop.close()
-        
-        return result
+        # ADK tools are sync wrappers; hand the coroutine to the long-lived research
+        # loop so clients and sessions inside hybrid_research survive between calls
+        future = asyncio.run_coroutine_threadsafe(
+            hybrid_research(hypothesis, instruments), _get_research_loop()
+        )
+        return future.result()
     except Exception as e:
         return {
             "status": "error",
             "error": str(e),
             "hypothesis": hypothesis
         }
+
+def _threaded_tool(tool):
+    """Async twin of a blocking tool that runs it in a worker thread.
+    
+    functools.wraps keeps the name, docstring and signature, so ADK declares the
+    same function to the model but awaits it instead of blocking the event loop.
+    """
+    @wraps(tool)
+    async def async_tool(*args, **kwargs):
+        return await asyncio.to_thread(tool, *args, **kwargs)
+    return async_tool
+
+market_data_search_async = _threaded_tool(market_data_search)
+news_search_async = _threaded_tool(news_search)
+market_trends_tool_async = _threaded_tool(market_trends_tool)
+hybrid_research_tool_async = _threaded_tool(hybrid_research_tool)
+sentiment_search_tool_async = _threaded_tool(sentiment_search_tool)
+smart_money_tool_async = _threaded_tool(smart_money_tool)
+smart_money_batch_tool_async = _threaded_tool(smart_money_batch_tool)
+
+# Tool set shared by the research, contradiction and financial agents
+RESEARCH_TOOLSET = (market_data_search_async, news_search_async, market_trends_tool_async, hybrid_research_tool_async)
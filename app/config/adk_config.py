@@ -1,6 +1,8 @@
 # app/config/adk_config.py
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 
 # ADK Configuration
 ADK_CONFIG = {
@@ -8,6 +10,8 @@ ADK_CONFIG = {
     "location": os.getenv("REGION", "us-central1"),
     "model": "gemini-2.0-flash",
     "use_vertex_ai": True,
+    # Attempts per agent run; each attempt is bounded by the agent's request_timeout (seconds)
+    "agent_attempts": int(os.getenv("AGENT_ATTEMPTS", "2")),
 }
 
 # Agent Configuration
@@ -17,47 +21,60 @@ AGENT_CONFIGS = {
         "description": "Processes and structures trading hypotheses",
         "model": "gemini-2.0-flash",
         "temperature": 0.2,
+        "request_timeout": 20.0,
     },
     "context_agent": {
         "name": "context_analyzer", 
         "description": "Analyzes trading hypotheses for context and asset information",
         "model": "gemini-2.0-flash",
         "temperature": 0.1,
+        "request_timeout": 20.0,
     },
     "research_agent": {
         "name": "market_researcher",
         "description": "Conducts market research using hybrid RAG and real-time data",
         "model": "gemini-2.0-flash", 
         "temperature": 0.1,
+        "request_timeout": 45.0,
     },
     "contradiction_agent": {
         "name": "risk_analyzer",
         "description": "Identifies contradictions and risk factors in investment thesis",
         "model": "gemini-2.0-flash",
         "temperature": 0.3,
+        "request_timeout": 45.0,
     },
     "synthesis_agent": {
         "name": "analysis_synthesizer",
         "description": "Synthesizes research and creates investment analysis",
         "model": "gemini-2.0-flash",
         "temperature": 0.2,
+        "request_timeout": 20.0,
     },
     "alert_agent": {
         "name": "alert_generator",
         "description": "Generates actionable alerts and recommendations",
         "model": "gemini-2.0-flash",
         "temperature": 0.1,
+        "request_timeout": 20.0,
     },
     "sentiment_proxy_agent": {
         "name": "sentiment_analyst",
         "description": "Analyzes retail sentiment vs institutional 'Smart Money' flows",
         "model": "gemini-2.0-flash",
         "temperature": 0.3,
+        "request_timeout": 45.0,
     },
     "financial_agent": {
         "name": "financial_expert",
         "description": "Expert financial advisor providing deep analysis and chat capabilities",
         "model": "gemini-2.0-flash",
         "temperature": 0.2,
+        "request_timeout": 45.0,
     }
 }
+
+@lru_cache(maxsize=None)
+def get_agent_config(name: str) -> Mapping[str, Any]:
+    """Return a read-only view of an agent's configuration."""
+    return MappingProxyType(AGENT_CONFIGS[name])
@@ -1,6 +1,6 @@
 # app/database/crud.py
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, insert, select
 from app.database.models import (
     TradingHypothesis, Contradiction, Confirmation, 
     ResearchData, Alert, PriceHistory
@@ -8,6 +8,14 @@ from app.database.models import (
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 
+# Core INSERT constructs built once and reused for every bulk save. Executed with a
+# list of rows, SQLAlchemy batches them into multi-row VALUES through insertmanyvalues
+# (page size set on the engine), so one cached statement serves every batch size.
+_INSERT_CONTRADICTION = insert(Contradiction).returning(Contradiction.id, sort_by_parameter_order=True)
+_INSERT_CONFIRMATION = insert(Confirmation).returning(Confirmation.id, sort_by_parameter_order=True)
+_INSERT_ALERT = insert(Alert)
+_INSERT_PRICE = insert(PriceHistory)
+
 class HypothesisCRUD:
     @staticmethod
     def create_hypothesis(db: Session, hypothesis_data: Dict[str, Any]) -> TradingHypothesis:
@@ -60,6 +68,13 @@ class ContradictionCRUD:
         db.refresh(db_contradiction)
         return db_contradiction
     
+    @staticmethod
+    def bulk_create_contradictions(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert many contradictions as multi-row INSERTs, returning their ids in row order. Caller commits."""
+        if not rows:
+            return []
+        return db.scalars(_INSERT_CONTRADICTION, rows).all()
+    
     @staticmethod
     def get_contradictions_by_hypothesis(db: Session, hypothesis_id: int) -> List[Contradiction]:
         """Get all contradictions for a hypothesis."""
@@ -75,6 +90,13 @@ class ConfirmationCRUD:
         db.refresh(db_confirmation)
         return db_confirmation
     
+    @staticmethod
+    def bulk_create_confirmations(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert many confirmations as multi-row INSERTs, returning their ids in row order. Caller commits."""
+        if not rows:
+            return []
+        return db.scalars(_INSERT_CONFIRMATION, rows).all()
+    
     @staticmethod
     def get_confirmations_by_hypothesis(db: Session, hypothesis_id: int) -> List[Confirmation]:
         """Get all confirmations for a hypothesis."""
@@ -105,6 +127,12 @@ class AlertCRUD:
         db.refresh(db_alert)
         return db_alert
     
+    @staticmethod
+    def bulk_create_alerts(db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Insert many alerts as multi-row INSERTs. Caller commits."""
+        if rows:
+            db.execute(_INSERT_ALERT, rows)
+    
     @staticmethod
     def get_alerts_by_hypothesis(db: Session, hypothesis_id: int) -> List[Alert]:
         """Get all alerts for a hypothesis."""
@@ -135,6 +163,12 @@ class PriceHistoryCRUD:
         db.refresh(db_price)
         return db_price
     
+    @staticmethod
+    def bulk_create_price_entries(db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Insert many price history entries as multi-row INSERTs. Caller commits."""
+        if rows:
+            db.execute(_INSERT_PRICE, rows)
+    
     @staticmethod
     def get_price_history(db: Session, hypothesis_id: int, symbol: str, days: int = 7) -> List[PriceHistory]:
         """Get price history for a symbol and hypothesis."""
@@ -156,24 +190,19 @@ class PriceHistoryCRUD:
 # Aggregate methods for dashboard
 class DashboardCRUD:
     @staticmethod
-    def get_hypothesis_summary(db: Session, hypothesis_id: int) -> Dict[str, Any]:
-        """Get complete hypothesis summary with counts and data."""
-        hypothesis = HypothesisCRUD.get_hypothesis(db, hypothesis_id)
-        if not hypothesis:
+    def _trend_symbol(hypothesis: TradingHypothesis) -> Optional[str]:
+        """Pick the instrument whose price history drives the trend chart."""
+        if not hypothesis.instruments:
             return None
-        
-        contradictions = ContradictionCRUD.get_contradictions_by_hypothesis(db, hypothesis_id)
-        confirmations = ConfirmationCRUD.get_confirmations_by_hypothesis(db, hypothesis_id)
-        alerts = AlertCRUD.get_alerts_by_hypothesis(db, hypothesis_id)
-        
-        # Get recent price data
-        if hypothesis.instruments:
-            # Assuming first instrument for trend
-            symbol = hypothesis.instruments[0] if isinstance(hypothesis.instruments, list) else hypothesis.instruments.get('primary')
-            price_history = PriceHistoryCRUD.get_price_history(db, hypothesis_id, symbol, days=30)
-        else:
-            price_history = []
-        
+        # Assuming first instrument for trend
+        if isinstance(hypothesis.instruments, list):
+            return hypothesis.instruments[0]
+        return hypothesis.instruments.get('primary')
+    
+    @staticmethod
+    def _build_summary(hypothesis: TradingHypothesis, contradictions: List[Contradiction],
+                       confirmations: List[Confirmation], alerts: List[Alert],
+                       price_history: List[PriceHistory]) -> Dict[str, Any]:
         return {
             "hypothesis": hypothesis,
             "contradictions_count": len(contradictions),
@@ -189,13 +218,59 @@ class DashboardCRUD:
         }
     
     @staticmethod
-    def get_all_hypotheses_summary(db: Session) -> List[Dict[str, Any]]:
-        """Get summary for all hypotheses for dashboard cards."""
-        hypotheses = HypothesisCRUD.get_hypotheses(db)
-        summaries = []
+    def get_hypothesis_summary(db: Session, hypothesis_id: int) -> Dict[str, Any]:
+        """Get complete hypothesis summary with counts and data."""
+        hypothesis = HypothesisCRUD.get_hypothesis(db, hypothesis_id)
+        if not hypothesis:
+            return None
+        
+        contradictions = ContradictionCRUD.get_contradictions_by_hypothesis(db, hypothesis_id)
+        confirmations = ConfirmationCRUD.get_confirmations_by_hypothesis(db, hypothesis_id)
+        alerts = AlertCRUD.get_alerts_by_hypothesis(db, hypothesis_id)
+        
+        # Get recent price data
+        symbol = DashboardCRUD._trend_symbol(hypothesis)
+        price_history = PriceHistoryCRUD.get_price_history(db, hypothesis_id, symbol, days=30) if symbol else []
+        
+        return DashboardCRUD._build_summary(hypothesis, contradictions, confirmations, alerts, price_history)
+    
+    @staticmethod
+    def get_all_hypotheses_summary(db: Session, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get summary for all hypotheses for dashboard cards (fixed number of queries)."""
+        hypotheses = db.scalars(
+            select(TradingHypothesis)
+            .options(
+                selectinload(TradingHypothesis.contradictions),
+                selectinload(TradingHypothesis.confirmations),
+                selectinload(TradingHypothesis.alerts),
+            )
+            .order_by(desc(TradingHypothesis.created_at))
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        if not hypotheses:
+            return []
         
-        for hyp in hypotheses:
-            summary = DashboardCRUD.get_hypothesis_summary(db, hyp.id)
-            summaries.append(summary)
+        # Last 30 days of prices for every hypothesis in one query, grouped in Python
+        cutoff_date = datetime.utcnow() - timedelta(days=30)
+        prices_by_key: Dict[tuple, List[PriceHistory]] = {}
+        for price in db.scalars(
+            select(PriceHistory)
+            .where(
+                PriceHistory.hypothesis_id.in_([h.id for h in hypotheses]),
+                PriceHistory.timestamp >= cutoff_date,
+            )
+            .order_by(PriceHistory.timestamp)
+        ):
+            prices_by_key.setdefault((price.hypothesis_id, price.symbol), []).append(price)
         
-        return summaries
+        return [
+            DashboardCRUD._build_summary(
+                hyp,
+                hyp.contradictions,
+                hyp.confirmations,
+                hyp.alerts,
+                prices_by_key.get((hyp.id, DashboardCRUD._trend_symbol(hyp)), []),
+            )
+            for hyp in hypotheses
+        ]
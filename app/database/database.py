@@ -1,14 +1,19 @@
 # app/database/database.py
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from functools import lru_cache
 from app.database.models import Base
 import os
+import logging
+import threading
 from dotenv import load_dotenv
 from google.cloud.sql.connector import Connector
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Cloud SQL Configuration
 PROJECT_ID = os.getenv("PROJECT_ID", "tradesage-mvp")
 REGION = os.getenv("REGION", "us-central1")
@@ -19,6 +24,26 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")  # New: for local connection
 DB_PORT = os.getenv("DB_PORT", "5432")  # New: for local connection
 
+# Pool sized per worker process. Every uvicorn worker (WEB_CONCURRENCY, 4 in the
+# Dockerfile) opens its own pool, so DB_CONNECTION_BUDGET (the instance's share of
+# Cloud SQL max_connections) is split across them: half steady, half burst overflow.
+# Pre-ping stays on: pg8000 sends nothing on checkout, so connections Cloud SQL
+# dropped while idle are only caught by the ping.
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", "40"))
+WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "4")))
+_PER_WORKER_CONNECTIONS = max(2, DB_CONNECTION_BUDGET // WEB_WORKERS)
+
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", str(_PER_WORKER_CONNECTIONS // 2))),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", str(_PER_WORKER_CONNECTIONS - _PER_WORKER_CONNECTIONS // 2))),
+    "pool_timeout": 10,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+    "pool_reset_on_return": "rollback",
+}
+# Never pre-open more than the steady pool keeps
+POOL_WARM_CONNECTIONS = min(int(os.getenv("DB_POOL_WARM", "4")), POOL_SETTINGS["pool_size"])
+
 def create_db_engine():
     """Create engine for either Cloud SQL or Local PostgreSQL"""
     if not DB_PASSWORD:
@@ -26,71 +51,110 @@ def create_db_engine():
 
     # Option 1: Local / Direct Connection (if DB_HOST is provided)
     if DB_HOST:
-        print(f"[LOCAL] Connecting to Local/Direct PostgreSQL at {DB_HOST}:{DB_PORT}...")
+        logger.info("[LOCAL] Connecting to Local/Direct PostgreSQL at %s:%s...", DB_HOST, DB_PORT)
         connection_url = f"postgresql+pg8000://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DATABASE_NAME}"
         engine = create_engine(
             connection_url,
-            pool_pre_ping=True,
-            pool_recycle=300,
+            insertmanyvalues_page_size=1000,
+            **POOL_SETTINGS,
             echo=False
         )
-        return engine, None
+        return engine
 
-    # Option 2: Cloud SQL Connector
-    print("[CLOUD] Connecting to Cloud SQL PostgreSQL via Connector...")
-    try:
-        connector = Connector()
-        
-        def getconn():
-            return connector.connect(
-                f"{PROJECT_ID}:{REGION}:{INSTANCE_NAME}",
-                "pg8000",
-                user=DB_USER,
-                password=DB_PASSWORD,
-                db=DATABASE_NAME
-            )
-        
-        engine = create_engine(
-            "postgresql+pg8000://",
-            creator=getconn,
-            pool_pre_ping=True,
-            pool_recycle=300,
-            echo=False
+    # Option 2: Cloud SQL Connector (created lazily by the first pooled connection)
+    logger.info("[CLOUD] Connecting to Cloud SQL PostgreSQL via Connector...")
+    
+    def getconn():
+        return _get_connector().connect(
+            f"{PROJECT_ID}:{REGION}:{INSTANCE_NAME}",
+            "pg8000",
+            user=DB_USER,
+            password=DB_PASSWORD,
+            db=DATABASE_NAME,
+            enable_iam_auth=False  # password auth; skip IAM token refresh
         )
-        return engine, connector
-    except Exception as e:
-        print(f"[ERROR] Failed to initialize Cloud SQL Connector: {e}")
-        print("💡 TIP: If you are running locally without GCP credentials, set DB_HOST and DB_PORT in your .env file.")
-        raise
+    
+    return create_engine(
+        "postgresql+pg8000://",
+        creator=getconn,
+        insertmanyvalues_page_size=1000,
+        **POOL_SETTINGS,
+        echo=False
+    )
+
+connector = None
+_connector_lock = threading.Lock()
 
-# Create the engine
-engine, connector = create_db_engine()
-print("[OK] Database engine created")
+def _get_connector() -> Connector:
+    """Create the Cloud SQL Connector on first connect and share it across the pool."""
+    global connector
+    with _connector_lock:
+        if connector is None:
+            try:
+                # Lazy refresh fetches instance certificates on demand instead of
+                # running a background refresh task per instance
+                connector = Connector(refresh_strategy="lazy")
+            except Exception as e:
+                logger.error("[ERROR] Failed to initialize Cloud SQL Connector: %s", e)
+                logger.warning("💡 TIP: If you are running locally without GCP credentials, set DB_HOST and DB_PORT in your .env file.")
+                raise
+        return connector
 
-# Create session maker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@lru_cache(maxsize=1)
+def get_engine():
+    """Create the engine on first use so importing this module opens no connections."""
+    engine = create_db_engine()
+    logger.info("[OK] Database engine created")
+    return engine
+
+def __getattr__(name):
+    # Keeps `from app.database.database import engine` working for scripts
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+def SessionLocal() -> Session:
+    """Create a session bound to the (lazily created) engine."""
+    return _session_factory(bind=get_engine())
 
 def create_tables():
     """Create all tables in the database."""
     try:
-        Base.metadata.create_all(bind=engine)
-        print("[OK] Database tables created successfully")
+        Base.metadata.create_all(bind=get_engine())
+        logger.info("[OK] Database tables created successfully")
     except Exception as e:
-        print(f"[ERROR] Error creating tables: {e}")
+        logger.error("[ERROR] Error creating tables: %s", e)
         raise
 
 def get_db():
-    """Dependency to get database session."""
+    """Dependency to get database session; a connection is checked out on first use."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+def warm_pool(connections: int = POOL_WARM_CONNECTIONS):
+    """Open and return a few pooled connections so first requests skip the handshake."""
+    conns = []
+    try:
+        for _ in range(connections):
+            conns.append(get_engine().connect())
+    except Exception as e:
+        logger.warning("[WARN] Pool warm-up stopped early: %s", e)
+    finally:
+        for conn in conns:
+            conn.close()
+
 def close_connections():
     """Close database connections (important for Cloud SQL)"""
     if connector:
         connector.close()
 
-# Initialize database on module import
-create_tables()
+def init_db():
+    """Startup hook: create missing tables and pre-warm the connection pool."""
+    create_tables()
+    warm_pool()
+
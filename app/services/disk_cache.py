@@ -0,0 +1,84 @@
+# app/services/disk_cache.py - SQLite-backed TTL cache that survives process restarts
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are swept after this many writes
+PRUNE_EVERY_WRITES = 256
+
+class DiskCache:
+    """Persistent key/value store with per-entry expiry, shared by every worker on the host.
+
+    Values must be JSON-serializable. Any SQLite error is logged and treated as a
+    cache miss, so an unwritable cache directory never breaks a fetch.
+    """
+
+    def __init__(self, directory: str, filename: str = "cache.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+        try:
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                os.path.join(directory, filename),
+                timeout=5,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        except Exception as e:
+            logger.warning("⚠️  Disk cache disabled (%s): %s", directory, e)
+
+    def get(self, key: str):
+        """Return (value, expires_at) for a live entry, or None."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                ).fetchone()
+        except Exception as e:
+            logger.warning("⚠️  Disk cache read failed for %s: %s", key, e)
+            return None
+        if row is None:
+            return None
+        return orjson.loads(row[0]), row[1]
+
+    def set(self, key: str, value, expire: float):
+        if self._conn is None:
+            return
+        try:
+            payload = orjson.dumps(value)
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, now + expire),
+                )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY_WRITES == 0:
+                    self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        except Exception as e:
+            logger.warning("⚠️  Disk cache write failed for %s: %s", key, e)
+
+    def clear(self):
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM cache")
+        except Exception as e:
+            logger.warning("⚠️  Disk cache clear failed: %s", e)
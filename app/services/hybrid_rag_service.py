@@ -2,6 +2,7 @@
 import asyncio
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import vertexai
@@ -38,6 +39,8 @@ class HybridRAGService:
         # Database connection
         self.connector = None
         self.connection = None
+        # One DB-API connection is shared by every research call; queries take turns
+        self._db_lock = threading.Lock()
         self._connect_to_database()
         
         # Real-time service imports
@@ -128,14 +131,47 @@ class HybridRAGService:
         try:
             print("📚 Searching RAG database...")
             
-            # Generate embedding for hypothesis
-            query_embedding = self.embedding_model.get_embeddings([hypothesis])[0].values
+            # Generate embedding for hypothesis; the Vertex call and the DB query block,
+            # so both run in worker threads to keep the shared research loop free
+            embeddings = await asyncio.to_thread(self.embedding_model.get_embeddings, [hypothesis])
+            query_embedding = embeddings[0].values
             embedding_list = query_embedding.tolist() if hasattr(query_embedding, 'tolist') else list(query_embedding)
             embedding_str = '[' + ','.join(map(str, embedding_list)) + ']'
             
+            results = await asyncio.to_thread(self._query_documents, embedding_str, limit)
+            
+            # Format results
+            historical_insights = []
+            for row in results:
+                title, content, instrument, source_type, date_published, similarity = row
+                
+                historical_insights.append({
+                    "title": title,
+                    "content_preview": content[:300] + "..." if len(content) > 300 else content,
+                    "full_content": content,
+                    "instrument": instrument,
+                    "source": source_type,
+                    "date": str(date_published) if date_published else "Unknown",
+                    "similarity": float(similarity),
+                    "data_source": "rag_database"
+                })
+            
+            return {
+                "historical_insights": historical_insights,
+                "search_query": hypothesis,
+                "total_found": len(historical_insights)
+            }
+            
+        except Exception as e:
+            print(f"❌ RAG search error: {str(e)}")
+            return {"historical_insights": [], "error": str(e)}
+    
+    def _query_documents(self, embedding_str: str, limit: int) -> List[tuple]:
+        """Nearest documents to the embedding, relaxing the similarity threshold until some match"""
+        with self._db_lock:
             # Search with different similarity thresholds
             thresholds = [0.4, 0.3, 0.2]  # Start with higher quality, fall back if needed
-            
+        
             for threshold in thresholds:
                 cursor = self.connection.cursor()
                 try:
@@ -152,44 +188,20 @@ class HybridRAGService:
                         ORDER BY embedding <=> %s
                         LIMIT %s;
                     """
-                    
+                
                     cursor.execute(query, [embedding_str, embedding_str, threshold, embedding_str, limit])
                     results = cursor.fetchall()
-                    
+                
                     if results:
                         print(f"   Found {len(results)} results with threshold {threshold}")
                         break
-                        
+                    
                 finally:
                     cursor.close()
             else:
                 results = []
-            
-            # Format results
-            historical_insights = []
-            for row in results:
-                title, content, instrument, source_type, date_published, similarity = row
-                
-                historical_insights.append({
-                    "title": title,
-                    "content_preview": content[:300] + "..." if len(content) > 300 else content,
-                    "full_content": content,
-                    "instrument": instrument,
-                    "source": source_type,
-                    "date": str(date_published) if date_published else "Unknown",
-                    "similarity": float(similarity),
-                    "data_source": "rag_database"
-                })
-            
-            return {
-                "historical_insights": historical_insights,
-                "search_query": hypothesis,
-                "total_found": len(historical_insights)
-            }
-            
-        except Exception as e:
-            print(f"❌ RAG search error: {str(e)}")
-            return {"historical_insights": [], "error": str(e)}
+        
+            return results
     
     async def _real_time_search(self, hypothesis: str, instruments: List[str]) -> Dict[str, Any]:
         """Fetch real-time market data and news"""
@@ -203,26 +215,19 @@ class HybridRAGService:
         news_data = {}
         
         try:
-            # Fetch market data for each instrument
-            if self.market_data_tool:
-                for instrument in instruments[:3]:  # Limit to avoid rate limits
-                    try:
-                        print(f"   📊 Fetching market data for {instrument}")
-                        data = self.market_data_tool(instrument, "auto", self.project_id)
-                        market_data[instrument] = data
-                    except Exception as e:
-                        print(f"   ⚠️  Market data failed for {instrument}: {str(e)}")
-                        market_data[instrument] = {"error": str(e)}
+            # Per-instrument market data and the news query are independent blocking
+            # HTTP calls; run them on worker threads concurrently
+            selected = instruments[:3]  # Limit to avoid rate limits
+            market_task = (
+                asyncio.gather(*(self.research_one(instrument) for instrument in selected))
+                if self.market_data_tool else None
+            )
+            news_task = asyncio.create_task(self._fetch_news(hypothesis)) if self.news_data_tool else None
             
-            # Fetch recent news
-            if self.news_data_tool:
-                try:
-                    news_query = self._create_news_query(hypothesis)
-                    print(f"   📰 Fetching news for: {news_query}")
-                    news_data = self.news_data_tool(news_query, 7, self.project_id)
-                except Exception as e:
-                    print(f"   ⚠️  News fetch failed: {str(e)}")
-                    news_data = {"error": str(e)}
+            if market_task is not None:
+                market_data = dict(zip(selected, await market_task))
+            if news_task is not None:
+                news_data = await news_task
             
             return {
                 "market_data": market_data,
@@ -235,6 +240,25 @@ class HybridRAGService:
             print(f"❌ Real-time search error: {str(e)}")
             return {"market_data": {}, "news_data": {}, "error": str(e)}
     
+    async def research_one(self, instrument: str) -> Dict[str, Any]:
+        """Fetch real-time market data for a single instrument off the event loop."""
+        try:
+            print(f"   📊 Fetching market data for {instrument}")
+            return await asyncio.to_thread(self.market_data_tool, instrument, "auto", self.project_id)
+        except Exception as e:
+            print(f"   ⚠️  Market data failed for {instrument}: {str(e)}")
+            return {"error": str(e)}
+    
+    async def _fetch_news(self, hypothesis: str) -> Dict[str, Any]:
+        """Fetch recent news for the hypothesis off the event loop."""
+        try:
+            news_query = self._create_news_query(hypothesis)
+            print(f"   📰 Fetching news for: {news_query}")
+            return await asyncio.to_thread(self.news_data_tool, news_query, 7, self.project_id)
+        except Exception as e:
+            print(f"   ⚠️  News fetch failed: {str(e)}")
+            return {"error": str(e)}
+    
     def _merge_results(self, rag_results: Dict, real_time_results: Dict, hypothesis: str) -> Dict[str, Any]:
         """Intelligently merge RAG and real-time results"""
         
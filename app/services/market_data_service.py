@@ -1,61 +1,194 @@
 # app/services/market_data_service.py - Real data only, no mock fallbacks
 
+import asyncio
+import codecs
 import requests
 import os
 import time
-import json
+import orjson
+import logging
+import re
+import threading
+import numpy as np
 import yfinance as yf
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from app.services.disk_cache import DiskCache
+from app.adk.rate_limiter import RateLimitExceeded, call_with_backoff
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, every process runs its own warmer
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent symbol fetches in get_multiple_quotes
+QUOTE_WORKERS = 8
+
+# Dates from providers are shifted into the simulated year
+SIMULATION_YEAR = 2026
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+
+# NVDA 2025 Baseline is ~130, Target 2026 Baseline is ~190
+SIMULATION_PRICE_FACTOR = 1.43
+NVDA_SIMULATED_ABOVE = 175
+
+# Ticker shapes Yahoo and the quote APIs accept: AAPL, BRK.B, ^GSPC, BTC-USD, GC=F
+_SYMBOL_RE = re.compile(r'[A-Z0-9.\-^=]{1,15}$')
+
+# How long a provider that answered with a rate-limit error is skipped
+PROVIDER_COOLDOWN_SECONDS = 60
+
+def _is_rate_limit_error(error):
+    text = str(error).lower()
+    return "rate limit" in text or "429" in text or "too many requests" in text
+
+# Cache lifetimes: quotes move intraday, daily history only changes once a day
+QUOTE_CACHE_TTL = 60
+HISTORY_CACHE_TTL = 86400
+# Company name/sector change rarely; fetched once per symbol from yfinance's slow info call
+METADATA_CACHE_TTL = 86400
+# Moving averages over daily closes; shared by the trends and smart money tools
+TRENDS_CACHE_TTL = 60
+# Institutional holdings come from quarterly 13F filings
+HOLDERS_CACHE_TTL = 86400
+HOLDERS_TOP_N = 5
+_HOLDER_COLUMNS = ['Holder', 'Shares', 'Value']
+# Parsed quote-page fields; short-lived, memory only
+SCRAPE_CACHE_TTL = 30
+MAX_CACHE_ENTRIES = 1024
+
+# Symbols per request for the multi-symbol quote endpoints
+FMP_BATCH_SIZE = 100
+YAHOO_BATCH_SIZE = 10
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Quote-page scraping: one regex pass over the HTML instead of a bs4 DOM
+_QUOTE_TAG_RE = re.compile(r'<(fin-streamer|span)\b([^>]*)>([^<]*)')
+_ATTR_RE = re.compile(r'([\w:-]+)="([^"]*)"')
+_PREV_CLOSE_CELL_RE = re.compile(r'Previous Close\s*</td>\s*<td[^>]*>\s*(?:<[^>]+>\s*)*([\d,.]+)')
+_NAME_RE = re.compile(r'<h1[^>]*data-reactid="7"[^>]*>([^<]*)')
+
+_PREV_CLOSE_FIELD_RE = re.compile(r'data-field="regularMarketPreviousClose"[^>]*>')
+
+# Quote pages run to ~1 MB but the fields we need sit near the top
+SCRAPE_CHUNK_BYTES = 65536
+SCRAPE_MAX_BYTES = 1024 * 1024
+
+_PRICE_STRIP = str.maketrans('', '', ',$')
+
+def _parse_number(text):
+    return float(text.translate(_PRICE_STRIP).strip())
+
+def _create_http_session():
+    """Pooled session shared by all fetchers, retrying transient gateway errors"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset(["GET"]))
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'User-Agent': BROWSER_USER_AGENT})
+    return session
+
+# One keep-alive session for yfinance lookups, so batch holder fetches share
+# connections instead of each Ticker opening its own
+_yf_session = requests.Session()
+_yf_session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
 
 class MarketDataService:
+    # Symbols treated as cryptocurrency when scraped, and the names get_crypto_data accepts
+    _CRYPTO_PREFIXES = ('BTC', 'ETH', 'SOL', 'ADA')
+    _CRYPTO_ALIASES = {
+        'BTC': 'BTC-USD', 'BITCOIN': 'BTC-USD',
+        'ETH': 'ETH-USD', 'ETHEREUM': 'ETH-USD',
+        'SOL': 'SOL-USD', 'SOLANA': 'SOL-USD',
+        'ADA': 'ADA-USD', 'CARDANO': 'ADA-USD',
+    }
+    
     def __init__(self):
         # Load API keys from environment
         self.alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY")
         self.fmp_key = os.getenv("FMP_API_KEY")
         
+        # One keep-alive connection pool per provider host
+        self._http = _create_http_session()
+        
         # Cache to prevent redundant calls
+        # symbol -> (data, expires_at); history keyed by symbol and window
         self._cache = {}
-        self._cache_duration = 300  # 5 minutes
+        self._history_cache = {}
+        self._scrape_cache = {}
+        self._metadata_cache = {}
+        self._trends_cache = {}
+        self._holders_cache = {}
+        # symbol -> (yf.Ticker on _yf_session, created_at)
+        self._tickers = {}
+        self._cache_duration = QUOTE_CACHE_TTL
+        self._cache_lock = threading.Lock()
+        
+        # Persistent second tier so restarts start warm; MDS_CACHE_DIR="" disables it
+        cache_dir = os.getenv("MDS_CACHE_DIR", "/tmp/mds_cache")
+        self._disk_cache = DiskCache(cache_dir) if cache_dir else None
+        self._cache_dir = cache_dir
         
-        print("Market data service initialized with:")
-        print(f"- Alpha Vantage API key: {'Available' if self.alpha_vantage_key else 'Not found'}")
-        print(f"- FMP API key: {'Available' if self.fmp_key else 'Not found'}")
+        # provider -> time until which it is skipped after a rate-limit error
+        self._provider_cooldown = {'alpha_vantage': 0, 'fmp': 0, 'yfinance': 0, 'yahoo': 0}
+        
+        # Background quote warmer, see start_warmer
+        self._warm_thread = None
+        self._warm_stop = threading.Event()
+        self._warm_lock_file = None
+        
+        # Thread pool for multi-symbol fetches, created on first use
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+        logger.info("Market data service initialized with:")
+        logger.info("- Alpha Vantage API key: %s", 'Available' if self.alpha_vantage_key else 'Not found')
+        logger.info("- FMP API key: %s", 'Available' if self.fmp_key else 'Not found')
         
         if not self.alpha_vantage_key and not self.fmp_key:
-            print("⚠️  WARNING: No API keys found. Market data will be limited to Yahoo Finance scraping.")
+            logger.warning("⚠️  WARNING: No API keys found. Market data will be limited to yfinance and Yahoo Finance.")
             
     def _apply_time_shift(self, date_str):
         """
         Shifts a date string forward to match current simulation year (2026).
-        Input format: 'YYYY-MM-DD'
+        Input format: 'YYYY-MM-DD' (a trailing ' HH:MM:SS' is dropped)
         """
+        if not date_str:
+            return datetime.now().strftime('%Y-%m-%d')
+        
+        day = date_str.split(' ')[0]
+        if not _ISO_DATE_RE.match(day):
+            return date_str
         try:
-            if not date_str:
-                return datetime.now().strftime('%Y-%m-%d')
-            
-            # If it's already 2026, don't shift
-            dt = None
-            if ' ' in date_str: # Handle 'YYYY-MM-DD HH:MM:SS'
-                dt = datetime.strptime(date_str.split(' ')[0], '%Y-%m-%d')
-            else:
-                dt = datetime.strptime(date_str, '%Y-%m-%d')
-            
-            simulation_year = 2026
-            if dt.year < simulation_year:
-                year_diff = simulation_year - dt.year
-                try:
-                    dt = dt.replace(year=dt.year + year_diff)
-                except ValueError: # Leap year case
-                    dt = dt + timedelta(days=year_diff*365)
-                    
-            return dt.strftime('%Y-%m-%d')
-        except Exception as e:
+            parsed = date.fromisoformat(day)  # rejects impossible dates like 2025-02-30
+        except ValueError:
             return date_str
+        
+        # If it's already 2026, don't shift
+        if parsed.year >= SIMULATION_YEAR:
+            return day
+        
+        if day.endswith('-02-29'): # Leap year case: no Feb 29 in the target year
+            return (parsed + timedelta(days=(SIMULATION_YEAR - parsed.year) * 365)).isoformat()
+        
+        return f"{SIMULATION_YEAR}{day[4:]}"
 
     def _apply_simulation_price(self, symbol, price):
         """
         Simulates 2026 bull-market prices by applying an inflation factor.
-        We ensure we don't double-simulate.
+        We ensure we don't double-simulate. Returns the price rounded to
+        cents, so callers use it as-is.
         """
         try:
             if not price or price <= 0:
@@ -65,20 +198,85 @@ class MarketDataService:
             # Let's be smarter: if year is already 2026, don't simulate price? 
             # No, we simulate 2025 prices TO 2026.
             
-            # NVDA 2025 Baseline is ~130
-            # Target 2026 Baseline is ~190
-            factor = 1.43
-            
             # Allow a small buffer: if price is > 190, maybe it's already simulated
-            if symbol.upper() == "NVDA" and price > 175:
+            if symbol.upper() == "NVDA" and price > NVDA_SIMULATED_ABOVE:
                 return round(price, 2)
             
-            return round(price * factor, 2)
+            return round(price * SIMULATION_PRICE_FACTOR, 2)
         except:
             return price
     
-    def get_stock_data(self, symbol):
-        """Main method to fetch stock data - real data only, no mocks"""
+    def _apply_simulation_prices(self, symbol, prices):
+        """Vectorized _apply_simulation_price for a series of closes; returns a rounded array"""
+        prices = np.asarray(prices, dtype=float)
+        keep = prices <= 0
+        if symbol.upper() == "NVDA":
+            keep |= prices > NVDA_SIMULATED_ABOVE
+        return np.where(keep, prices, prices * SIMULATION_PRICE_FACTOR).round(2)
+    
+    def _disk_key(self, cache, key):
+        if cache is self._history_cache:
+            prefix = 'history'
+        elif cache is self._metadata_cache:
+            prefix = 'metadata'
+        elif cache is self._trends_cache:
+            prefix = 'trends'
+        elif cache is self._holders_cache:
+            prefix = 'holders'
+        else:
+            prefix = 'quote'
+        return f"{prefix}:{key}"
+    
+    def _memory_get(self, cache, key):
+        """Return a live in-memory entry, dropping it if it has expired"""
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is not None:
+                if entry[1] > time.time():
+                    return entry[0]
+                del cache[key]
+        return None
+    
+    def _cache_get(self, cache, key):
+        """Return a live cache entry; memory first, then disk"""
+        data = self._memory_get(cache, key)
+        if data is not None:
+            return data
+        if self._disk_cache is None:
+            return None
+        entry = self._disk_cache.get(self._disk_key(cache, key))
+        if entry is None:
+            return None
+        # Promote to memory for the rest of its lifetime
+        self._memory_put(cache, key, entry[0], entry[1])
+        return entry[0]
+    
+    def _memory_put(self, cache, key, data, expires_at):
+        with self._cache_lock:
+            cache.pop(key, None)
+            cache[key] = (data, expires_at)
+            # Evict the oldest entries once the cap is reached
+            while len(cache) > MAX_CACHE_ENTRIES:
+                del cache[next(iter(cache))]
+    
+    def _cache_put(self, cache, key, data, ttl):
+        self._memory_put(cache, key, data, time.time() + ttl)
+        if self._disk_cache is not None:
+            self._disk_cache.set(self._disk_key(cache, key), data, ttl)
+    
+    def _paced(self, fn, *args, retries=2, **kwargs):
+        """Make an upstream call once the market_data budget allows it; cache hits never get here"""
+        return call_with_backoff("market_data", fn, *args, retries=retries, **kwargs)
+    
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=QUOTE_WORKERS, thread_name_prefix="market-data")
+            return self._executor
+    
+    def get_stock_data(self, symbol, refresh=False):
+        """Main method to fetch stock data - real data only, no mocks.
+        refresh=True skips the cache and replaces the entry with a fresh quote."""
         
         # Validate symbol
         if not symbol or len(symbol.strip()) == 0:
@@ -89,64 +287,52 @@ class MarketDataService:
             }
         
         symbol = symbol.upper().strip()
+        if not _SYMBOL_RE.match(symbol):
+            return {
+                'instrument': symbol,
+                'error': f'Invalid symbol format: {symbol}',
+                'status': 'error'
+            }
         
         # Check cache first
-        cache_key = f"{symbol}_{int(time.time() // self._cache_duration)}"
-        if cache_key in self._cache:
-            print(f"✅ Using cached data for {symbol}")
-            return self._cache[cache_key]
+        cached = None if refresh else self._cache_get(self._cache, symbol)
+        if cached is not None:
+            logger.debug("✅ Using cached data for %s", symbol)
+            return cached
         
         errors = []
         
-        # Try Alpha Vantage first (if key is available)
-        if self.alpha_vantage_key:
-            try:
-                print(f"🔍 Fetching {symbol} from Alpha Vantage...")
-                data = self._fetch_alpha_vantage(symbol)
-                self._cache[cache_key] = data
-                print(f"✅ Successfully fetched {symbol} from Alpha Vantage: ${data['data']['info']['currentPrice']}")
-                return data
-            except Exception as e:
-                error_msg = f"Alpha Vantage failed: {str(e)}"
-                print(f"❌ {error_msg}")
-                errors.append(error_msg)
-        
-        # Try FMP next (if key is available)
-        if self.fmp_key:
+        # Alpha Vantage and FMP need keys; yfinance is the reliable open source alternative
+        # and Yahoo Finance the absolute last resort
+        providers = (
+            ('alpha_vantage', 'Alpha Vantage', self._fetch_alpha_vantage, bool(self.alpha_vantage_key)),
+            ('fmp', 'FMP', self._fetch_fmp, bool(self.fmp_key)),
+            ('yfinance', 'yfinance', self._fetch_yfinance, True),
+            ('yahoo', 'Yahoo Finance', self._fetch_yahoo, True),
+        )
+        for provider, label, fetch, enabled in providers:
+            if not enabled:
+                continue
+            if self._provider_cooldown[provider] > time.time():
+                errors.append(f"{label} skipped: rate limited, cooling down")
+                continue
             try:
-                print(f"🔍 Fetching {symbol} from Financial Modeling Prep...")
-                data = self._fetch_fmp(symbol)
-                self._cache[cache_key] = data
-                print(f"✅ Successfully fetched {symbol} from FMP: ${data['data']['info']['currentPrice']}")
+                logger.debug("🔍 Fetching %s from %s...", symbol, label)
+                # Provider 429s are handled by the cooldown and fallback chain, not retried
+                data = self._paced(fetch, symbol, retries=0)
+                self._cache_put(self._cache, symbol, data, self._cache_duration)
+                logger.debug("✅ Successfully fetched %s from %s: $%s", symbol, label, data['data']['info']['currentPrice'])
                 return data
+            except RateLimitExceeded as e:
+                # The shared budget is spent; later providers would only queue again
+                errors.append(str(e))
+                break
             except Exception as e:
-                error_msg = f"FMP failed: {str(e)}"
-                print(f"❌ {error_msg}")
+                error_msg = f"{label} failed: {str(e)}"
+                logger.warning("❌ %s", error_msg)
                 errors.append(error_msg)
-        
-        # Try yfinance next (Reliable open source alternative)
-        try:
-            print(f"🔍 Fetching {symbol} from yfinance (API)...")
-            data = self._fetch_yfinance(symbol)
-            self._cache[cache_key] = data
-            print(f"✅ Successfully fetched {symbol} from yfinance: ${data['data']['info']['currentPrice']}")
-            return data
-        except Exception as e:
-            error_msg = f"yfinance failed: {str(e)}"
-            print(f"❌ {error_msg}")
-            errors.append(error_msg)
-
-        # Try Yahoo Finance scraping as absolute last resort
-        try:
-            print(f"🔍 Fetching {symbol} from Yahoo Finance (scraping)...")
-            data = self._fetch_yahoo(symbol)
-            self._cache[cache_key] = data
-            print(f"✅ Successfully fetched {symbol} from Yahoo Finance: ${data['data']['info']['currentPrice']}")
-            return data
-        except Exception as e:
-            error_msg = f"Yahoo Finance scraping failed: {str(e)}"
-            print(f"❌ {error_msg}")
-            errors.append(error_msg)
+                if _is_rate_limit_error(e):
+                    self._provider_cooldown[provider] = time.time() + PROVIDER_COOLDOWN_SECONDS
         
         # If all methods fail, return error
         all_errors = "; ".join(errors)
@@ -164,9 +350,35 @@ class MarketDataService:
             ]
         }
         
-        print(f"❌ Failed to fetch data for {symbol}: {all_errors}")
+        logger.warning("❌ Failed to fetch data for %s: %s", symbol, all_errors)
         return error_response
     
+    def _build_response(self, symbol, source, name, sector, market_cap, price, prev_close,
+                        change, change_percent, volume, last_updated=None, timestamp=None):
+        """Standard quote response shared by every provider; prices arrive already simulated and rounded"""
+        return {
+            'instrument': symbol,
+            'source': source,
+            'data': {
+                'symbol': symbol,
+                'info': {
+                    'name': name,
+                    'sector': sector,
+                    'marketCap': market_cap,
+                    'currentPrice': price,
+                    'previousClose': prev_close,
+                    'dayChange': round(change, 2),
+                    'dayChangePercent': round(change_percent, 2),
+                    'volume': volume,
+                    'lastUpdated': last_updated or self._apply_time_shift(None)
+                },
+                'recent_price': price,
+                'price_history': {}
+            },
+            'status': 'success',
+            'timestamp': timestamp or datetime.now().isoformat()
+        }
+    
     def _fetch_alpha_vantage(self, symbol):
         """Fetch data from Alpha Vantage API"""
         params = {
@@ -176,10 +388,10 @@ class MarketDataService:
         }
         
         url = "https://www.alphavantage.co/query"
-        response = requests.get(url, params=params, timeout=15)
+        response = self._http.get(url, params=params, timeout=15)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Check for API errors
         if 'Error Message' in data:
@@ -206,38 +418,28 @@ class MarketDataService:
         if price <= 0:
             raise Exception(f"Invalid price data: ${price}")
         
-        return {
-            'instrument': symbol,
-            'source': 'alpha_vantage',
-            'data': {
-                'symbol': symbol,
-                'info': {
-                    'name': f"{symbol} Stock",
-                    'sector': 'Unknown',  # Alpha Vantage quote doesn't include sector
-                    'marketCap': 0,  # Not available in quote endpoint
-                    'currentPrice': round(price, 2),
-                    'previousClose': round(prev_close, 2),
-                    'dayChange': round(change, 2),
-                    'dayChangePercent': round(change_percent, 2),
-                    'volume': int(quote.get('06. volume', 0)),
-                    'lastUpdated': self._apply_time_shift(quote.get('07. latest trading day'))
-                },
-                'recent_price': round(price, 2),
-                'price_history': {}  # Would need additional API call
-            },
-            'status': 'success',
-            'timestamp': datetime.now().isoformat()
-        }
+        return self._build_response(
+            symbol, 'alpha_vantage',
+            name=f"{symbol} Stock",
+            sector='Unknown',  # Alpha Vantage quote doesn't include sector
+            market_cap=0,  # Not available in quote endpoint
+            price=price,
+            prev_close=prev_close,
+            change=change,
+            change_percent=change_percent,
+            volume=int(quote.get('06. volume', 0)),
+            last_updated=self._apply_time_shift(quote.get('07. latest trading day'))
+        )
     
     def _fetch_fmp(self, symbol):
         """Fetch data from Financial Modeling Prep API"""
         url = f"https://financialmodelingprep.com/api/v3/quote/{symbol}"
         params = {'apikey': self.fmp_key}
         
-        response = requests.get(url, params=params, timeout=15)
+        response = self._http.get(url, params=params, timeout=15)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if not data or len(data) == 0:
             raise Exception("No data returned. Symbol may be invalid.")
@@ -245,8 +447,32 @@ class MarketDataService:
         if isinstance(data, dict) and 'Error Message' in data:
             raise Exception(f"API Error: {data['Error Message']}")
             
-        quote = data[0]
+        return self._parse_fmp_quote(symbol, data[0])
+    
+    def _fetch_fmp_batch(self, symbols, timestamp=None):
+        """Fetch quotes for several symbols in one FMP request, keyed by symbol"""
+        url = f"https://financialmodelingprep.com/api/v3/quote/{','.join(symbols)}"
+        params = {'apikey': self.fmp_key}
         
+        response = self._http.get(url, params=params, timeout=15)
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        
+        if isinstance(data, dict) and 'Error Message' in data:
+            raise Exception(f"API Error: {data['Error Message']}")
+        
+        results = {}
+        for quote in data or []:
+            symbol = quote.get('symbol')
+            try:
+                results[symbol] = self._parse_fmp_quote(symbol, quote, timestamp)
+            except Exception as e:
+                logger.warning("⚠️  Skipping FMP batch entry for %s: %s", symbol, e)
+        return results
+    
+    def _parse_fmp_quote(self, symbol, quote, timestamp=None):
+        """Build the standard response from one FMP quote entry"""
         # Validate price data
         try:
             raw_price = float(quote.get('price', 0))
@@ -262,161 +488,171 @@ class MarketDataService:
         if price <= 0:
             raise Exception(f"Invalid price data: ${price}")
         
-        return {
-            'instrument': symbol,
-            'source': 'fmp',
-            'data': {
-                'symbol': symbol,
-                'info': {
-                    'name': quote.get('name', f"{symbol} Stock"),
-                    'sector': quote.get('sector', 'Unknown'),
-                    'marketCap': market_cap,
-                    'currentPrice': round(price, 2),
-                    'previousClose': round(prev_close, 2),
-                    'dayChange': round(change, 2),
-                    'dayChangePercent': round(change_percent, 2),
-                    'volume': volume,
-                    'lastUpdated': self._apply_time_shift(datetime.now().strftime('%Y-%m-%d'))
-                },
-                'recent_price': round(price, 2),
-                'price_history': {}
-            },
-            'status': 'success',
-            'timestamp': datetime.now().isoformat()
-        }
+        return self._build_response(
+            symbol, 'fmp',
+            name=quote.get('name', f"{symbol} Stock"),
+            sector=quote.get('sector', 'Unknown'),
+            market_cap=market_cap,
+            price=price,
+            prev_close=prev_close,
+            change=change,
+            change_percent=change_percent,
+            volume=volume,
+            timestamp=timestamp
+        )
     
     
+    def _yfinance_metadata(self, symbol, ticker):
+        """(name, sector) from ticker.info, cached per symbol for METADATA_CACHE_TTL"""
+        cached = self._cache_get(self._metadata_cache, symbol)
+        if cached is not None:
+            return cached[0], cached[1]
+        try:
+            info = ticker.info
+        except Exception as e:
+            logger.debug("yfinance info unavailable for %s: %s", symbol, e)
+            return f"{symbol} Stock", "Unknown"
+        name = info.get('longName', f"{symbol} Stock")
+        sector = info.get('sector', "Unknown")
+        self._cache_put(self._metadata_cache, symbol, [name, sector], METADATA_CACHE_TTL)
+        return name, sector
+    
     def _fetch_yfinance(self, symbol):
         """Fetch data using yfinance library"""
-        import yfinance as yf
         ticker = yf.Ticker(symbol)
         
-        # history(period='1d') is more reliable for current price than ticker.info
-        hist = ticker.history(period='1d')
-        if hist.empty:
-            raise Exception(f"No price data found for {symbol} via yfinance history")
-            
-        current_raw_price = float(hist['Close'].iloc[-1])
+        # fast_info serves price, previous close, market cap and volume without the slow info scrape
+        fast_info = ticker.fast_info
+        try:
+            current_raw_price = float(fast_info.last_price)
+        except Exception:
+            raise Exception(f"No price data found for {symbol} via yfinance")
+        if not current_raw_price or current_raw_price != current_raw_price: # NaN when Yahoo has no bars
+            raise Exception(f"No price data found for {symbol} via yfinance")
         price = self._apply_simulation_price(symbol, current_raw_price)
         
         # Get previous close for change calculation
-        prev_close_raw = float(hist['Open'].iloc[-1]) # Default to today's open if prev isn't available
         try:
-            # Try to get actual previous day's close
-            prev_hist = ticker.history(period='2d')
-            if len(prev_hist) > 1:
-                prev_close_raw = float(prev_hist['Close'].iloc[-2])
+            prev_close_raw = float(fast_info.previous_close or current_raw_price)
         except:
-            pass
-            
+            prev_close_raw = current_raw_price
+        
         prev_close = self._apply_simulation_price(symbol, prev_close_raw)
         change = price - prev_close
         change_percent = (change / prev_close) * 100 if prev_close != 0 else 0
         
-        # Get additional info if possible (info can be slow/unreliable, so we use try/except)
-        name = f"{symbol} Stock"
         market_cap = 0
-        sector = "Unknown"
+        volume = 0
         try:
-            info = ticker.info
-            name = info.get('longName', name)
-            market_cap = info.get('marketCap', 0)
-            sector = info.get('sector', sector)
+            market_cap = int(fast_info.market_cap or 0)
+            volume = int(fast_info.last_volume or 0)
         except:
             pass
+        
+        # Name and sector only come from the slow ticker.info, so they are cached per symbol
+        name, sector = self._yfinance_metadata(symbol, ticker)
 
-        return {
-            'instrument': symbol,
-            'source': 'yfinance',
-            'data': {
-                'symbol': symbol,
-                'info': {
-                    'name': name,
-                    'sector': sector,
-                    'marketCap': market_cap,
-                    'currentPrice': round(price, 2),
-                    'previousClose': round(prev_close, 2),
-                    'dayChange': round(change, 2),
-                    'dayChangePercent': round(change_percent, 2),
-                    'volume': int(hist['Volume'].iloc[-1]),
-                    'lastUpdated': self._apply_time_shift(datetime.now().strftime('%Y-%m-%d'))
-                },
-                'recent_price': round(price, 2),
-                'price_history': {}
-            },
-            'status': 'success',
-            'timestamp': datetime.now().isoformat()
-        }
+        return self._build_response(
+            symbol, 'yfinance',
+            name=name,
+            sector=sector,
+            market_cap=market_cap,
+            price=price,
+            prev_close=prev_close,
+            change=change,
+            change_percent=change_percent,
+            volume=volume
+        )
 
+    def _fetch_yahoo_batch(self, symbols, timestamp=None):
+        """Fetch quotes for several symbols from Yahoo's JSON quote endpoint, keyed by symbol"""
+        response = self._http.get(YAHOO_QUOTE_URL, params={'symbols': ','.join(symbols)}, timeout=15)
+        response.raise_for_status()
+        
+        results = {}
+        for quote in orjson.loads(response.content).get('quoteResponse', {}).get('result') or []:
+            symbol = quote.get('symbol')
+            try:
+                results[symbol] = self._parse_yahoo_quote(symbol, quote, timestamp)
+            except Exception as e:
+                logger.warning("⚠️  Skipping Yahoo batch entry for %s: %s", symbol, e)
+        return results
+    
+    def _parse_yahoo_quote(self, symbol, quote, timestamp=None):
+        """Build the standard response from one Yahoo JSON quote entry"""
+        try:
+            price = self._apply_simulation_price(symbol, float(quote.get('regularMarketPrice') or 0))
+            prev_close = self._apply_simulation_price(symbol, float(quote.get('regularMarketPreviousClose') or 0))
+        except (ValueError, TypeError):
+            raise Exception("Invalid price data format from Yahoo Finance")
+        
+        if not price or price <= 0:
+            raise Exception(f"Invalid price data: ${price}")
+        
+        change = price - prev_close if prev_close else 0
+        change_percent = (change / prev_close * 100) if prev_close else 0
+        sector = quote.get('sector', 'Unknown')
+        if quote.get('quoteType') == 'CRYPTOCURRENCY':
+            sector = "Cryptocurrency"
+        
+        return self._build_response(
+            symbol, 'yahoo',
+            name=quote.get('longName') or quote.get('shortName') or symbol,
+            sector=sector,
+            market_cap=int(quote.get('marketCap') or 0),
+            price=price,
+            prev_close=prev_close or price,
+            change=change,
+            change_percent=change_percent,
+            volume=int(quote.get('regularMarketVolume') or 0),
+            timestamp=timestamp
+        )
+    
     def _fetch_yahoo(self, symbol):
+        """Fetch data from Yahoo Finance's JSON quote endpoint, scraping the quote page only if that fails"""
+        try:
+            quotes = self._fetch_yahoo_batch([symbol])
+            if symbol in quotes:
+                return quotes[symbol]
+            raise Exception(f"Symbol {symbol} not found on Yahoo Finance")
+        except Exception as e:
+            logger.warning("⚠️  Yahoo JSON quote failed for %s, scraping quote page: %s", symbol, e)
+        return self._scrape_yahoo(symbol)
+    
+    def _scrape_yahoo(self, symbol):
         """Fetch data from Yahoo Finance via web scraping"""
-        
-        # Handle different symbol formats
         yahoo_symbol = symbol
-        if '-' not in symbol and symbol not in ['BTC-USD', 'ETH-USD', 'SOL-USD']:
-            # Regular stock symbol
-            yahoo_symbol = symbol
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
         
         try:
-            url = f"https://finance.yahoo.com/quote/{yahoo_symbol}"
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            # Check if page indicates invalid symbol
-            if "Symbol Lookup" in response.text or "doesn't exist" in response.text:
-                raise Exception(f"Symbol {symbol} not found on Yahoo Finance")
-            
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the SPECIFIC price streamer for this symbol
-            symbol_upper = symbol.upper()
-            price_element = soup.find('fin-streamer', {'data-symbol': symbol_upper, 'data-field': 'regularMarketPrice'})
-            
-            if not price_element:
-                # Try fallback: first regularMarketPrice if specific one fails
-                price_element = soup.find('fin-streamer', {'data-field': 'regularMarketPrice'})
+            # Repeat scrapes within SCRAPE_CACHE_TTL skip both the page fetch and the parse
+            parsed = self._memory_get(self._scrape_cache, symbol)
+            if parsed is None:
+                url = f"https://finance.yahoo.com/quote/{yahoo_symbol}"
+                html = self._read_quote_page(url, symbol)
+                
+                # Check if page indicates invalid symbol
+                if "Symbol Lookup" in html or "doesn't exist" in html:
+                    raise Exception(f"Symbol {symbol} not found on Yahoo Finance")
                 
-            if not price_element:
-                # Try 2024/2025 alternative structure
-                price_element = soup.find('span', attrs={"data-test": "qsp-price"})
+                parsed = self._parse_quote_page(symbol, html)
+                if parsed[0] is not None:
+                    self._memory_put(self._scrape_cache, symbol, parsed, time.time() + SCRAPE_CACHE_TTL)
+            
+            price_val, prev_close_val, name = parsed
             
-            if not price_element:
+            if price_val is None:
                 raise Exception(f"Price element for {symbol} not found on Yahoo Finance")
             
             try:
-                # Some elements have 'value' attribute, others have text
-                price_val = price_element.get('value')
-                if not price_val:
-                    price_val = price_element.get_text()
-                
-                raw_price = float(price_val.replace(',', '').replace('$', ''))
+                raw_price = _parse_number(price_val)
                 price = self._apply_simulation_price(symbol, raw_price)
             except (ValueError, AttributeError):
-                # Another attempt for 2026-style structure
-                try:
-                    price_element = soup.find('fin-streamer', {'data-field': 'regularMarketPrice'})
-                    price_val = price_element.get('value') or price_element.get_text()
-                    raw_price = float(price_val.replace(',', '').replace('$', ''))
-                    price = self._apply_simulation_price(symbol, raw_price)
-                except:
-                    raise Exception(f"Could not parse price for {symbol} from Yahoo Finance")
+                raise Exception(f"Could not parse price for {symbol} from Yahoo Finance")
             
             if price <= 0:
                 raise Exception(f"Invalid price found: ${price}")
             
-            # Extract additional data
-            name = yahoo_symbol
-            try:
-                name_element = soup.find('h1', {'data-reactid': '7'})
-                if name_element:
-                    name = name_element.get_text().split('(')[0].strip()
-            except:
-                pass
+            name = name or yahoo_symbol
             
             # Extract previous close and calculate change
             prev_close = price  # Default fallback
@@ -424,226 +660,428 @@ class MarketDataService:
             change_percent = 0
             
             try:
-                # Look for previous close in summary table
-                summary_table = soup.find('div', {'data-test': 'quote-statistics'}) or soup.find('div', {'data-test': 'summary-table'})
-                if summary_table:
-                    rows = summary_table.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            label = cells[0].get_text().strip()
-                            if 'Previous Close' in label:
-                                prev_close = float(cells[1].get_text().replace(',', '').replace('$', ''))
-                                change = price - prev_close
-                                change_percent = (change / prev_close * 100) if prev_close != 0 else 0
-                                break
-            except:
+                if prev_close_val:
+                    prev_close = self._apply_simulation_price(symbol, _parse_number(prev_close_val))
+                    change = price - prev_close
+                    change_percent = (change / prev_close * 100) if prev_close != 0 else 0
+            except ValueError:
                 pass  # Use defaults
             
             # Determine sector (simplified)
             sector = "Unknown"
-            if any(crypto in yahoo_symbol for crypto in ['BTC', 'ETH', 'SOL', 'ADA']):
+            if any(crypto in yahoo_symbol for crypto in self._CRYPTO_PREFIXES):
                 sector = "Cryptocurrency"
             
-            return {
-                'instrument': symbol,
-                'source': 'yahoo_scraped',
-                'data': {
-                    'symbol': symbol,
-                    'info': {
-                        'name': name,
-                        'sector': sector,
-                        'marketCap': 0,  # Not easily scraped
-                        'currentPrice': round(price, 2),
-                        'previousClose': round(prev_close, 2),
-                        'dayChange': round(change, 2),
-                        'dayChangePercent': round(change_percent, 2),
-                        'volume': 0,  # Not easily scraped
-                        'lastUpdated': self._apply_time_shift(datetime.now().strftime('%Y-%m-%d'))
-                    },
-                    'recent_price': round(price, 2),
-                    'price_history': {}
-                },
-                'status': 'success',
-                'timestamp': datetime.now().isoformat()
-            }
+            return self._build_response(
+                symbol, 'yahoo_scraped',
+                name=name,
+                sector=sector,
+                market_cap=0,  # Not easily scraped
+                price=price,
+                prev_close=prev_close,
+                change=change,
+                change_percent=change_percent,
+                volume=0  # Not easily scraped
+            )
             
         except requests.RequestException as e:
             raise Exception(f"Network error accessing Yahoo Finance: {str(e)}")
         except Exception as e:
             raise Exception(f"Error scraping Yahoo Finance: {str(e)}")
     
+    def _read_quote_page(self, url, symbol):
+        """Stream a quote page only until the price and previous close have both arrived"""
+        symbol_tag = re.escape(f'data-symbol="{symbol.upper()}"')
+        price_re = re.compile(
+            rf'{symbol_tag}[^>]*data-field="regularMarketPrice"|data-field="regularMarketPrice"[^>]*{symbol_tag}'
+        )
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        parts = []
+        size = 0
+        has_price = has_prev_close = False
+        
+        with self._http.get(url, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=SCRAPE_CHUNK_BYTES):
+                # Re-scan a little of the previous chunk so tags split across chunks still match
+                tail = parts[-1][-2048:] if parts else ''
+                text = decoder.decode(chunk)
+                parts.append(text)
+                size += len(chunk)
+                window = tail + text
+                has_price = has_price or bool(price_re.search(window))
+                has_prev_close = has_prev_close or bool(
+                    _PREV_CLOSE_FIELD_RE.search(window) or _PREV_CLOSE_CELL_RE.search(window)
+                )
+                if (has_price and has_prev_close) or size >= SCRAPE_MAX_BYTES:
+                    break
+        
+        return ''.join(parts)
+    
+    def _parse_quote_page(self, symbol, html):
+        """Pull (price, previous close, name) strings out of a Yahoo quote page"""
+        symbol_upper = symbol.upper()
+        price_val = any_price_val = span_price_val = prev_close_val = None
+        
+        for tag, attr_text, text in _QUOTE_TAG_RE.findall(html):
+            attrs = dict(_ATTR_RE.findall(attr_text))
+            # Some elements have 'value' attribute, others have text
+            value = attrs.get('value') or text.strip() or None
+            if tag == 'fin-streamer':
+                field = attrs.get('data-field')
+                if field == 'regularMarketPrice':
+                    if attrs.get('data-symbol') == symbol_upper:
+                        price_val = value
+                        break
+                    if any_price_val is None:
+                        any_price_val = value
+                elif field == 'regularMarketPreviousClose' and prev_close_val is None:
+                    prev_close_val = value
+            elif span_price_val is None and attrs.get('data-test') == 'qsp-price':
+                span_price_val = value
+        
+        if prev_close_val is None:
+            match = _PREV_CLOSE_CELL_RE.search(html)
+            if match:
+                prev_close_val = match.group(1)
+        
+        name = None
+        match = _NAME_RE.search(html)
+        if match:
+            name = match.group(1).split('(')[0].strip() or None
+        
+        return price_val or any_price_val or span_price_val, prev_close_val, name
+    
     def get_crypto_data(self, crypto_symbol):
         """Specific method for cryptocurrency data"""
         # Ensure proper format for crypto symbols
         if not crypto_symbol.endswith('-USD'):
-            if crypto_symbol.upper() in ['BTC', 'BITCOIN']:
-                crypto_symbol = 'BTC-USD'
-            elif crypto_symbol.upper() in ['ETH', 'ETHEREUM']:
-                crypto_symbol = 'ETH-USD'
-            elif crypto_symbol.upper() in ['SOL', 'SOLANA']:
-                crypto_symbol = 'SOL-USD'
-            elif crypto_symbol.upper() in ['ADA', 'CARDANO']:
-                crypto_symbol = 'ADA-USD'
-            else:
-                crypto_symbol = f"{crypto_symbol.upper()}-USD"
+            upper = crypto_symbol.upper()
+            crypto_symbol = self._CRYPTO_ALIASES.get(upper, f"{upper}-USD")
         
         return self.get_stock_data(crypto_symbol)
     
-    def get_multiple_quotes(self, symbols):
-        """Fetch data for multiple symbols"""
+    def _fetch_batch_quotes(self, symbols):
+        """Resolve as many symbols as possible with multi-symbol requests (FMP, then Yahoo)"""
+        found = {}
+        # Every quote in the batch shares one timestamp
+        timestamp = datetime.now().isoformat()
+        batch_sources = []
+        if self.fmp_key:
+            batch_sources.append(('FMP', self._fetch_fmp_batch, FMP_BATCH_SIZE))
+        batch_sources.append(('Yahoo Finance', self._fetch_yahoo_batch, YAHOO_BATCH_SIZE))
+        
+        for source, fetch_batch, size in batch_sources:
+            missing = [s for s in symbols if s not in found]
+            for chunk in _chunks(missing, size):
+                try:
+                    logger.debug("🔍 Fetching %s quotes from %s in one request...", len(chunk), source)
+                    # Paced here, not in the batch fetchers: _fetch_yahoo calls those under its own token
+                    found.update(self._paced(fetch_batch, chunk, timestamp, retries=0))
+                except RateLimitExceeded as e:
+                    # The shared budget is spent; further batches would only queue again
+                    logger.warning("⚠️  %s batch quote shed: %s", source, e)
+                    return found
+                except Exception as e:
+                    logger.warning("⚠️  %s batch quote failed: %s", source, e)
+        return found
+    
+    def get_multiple_quotes(self, symbols, refresh=False):
+        """Fetch data for multiple symbols, batching requests where providers allow it.
+        refresh=True skips cached entries and replaces them in place."""
         results = {}
+        if not symbols:
+            return results
         
+        # Serve cached symbols first, then batch-fetch the rest
+        pending = {}
         for symbol in symbols:
-            try:
-                data = self.get_stock_data(symbol)
-                results[symbol] = data
-                
-                # Add small delay to avoid rate limiting
-                time.sleep(0.1)
-                
-            except Exception as e:
-                results[symbol] = {
-                    'instrument': symbol,
-                    'error': str(e),
-                    'status': 'error'
-                }
+            normalized = (symbol or '').upper().strip()
+            cached = self._cache_get(self._cache, normalized) if normalized and not refresh else None
+            if cached is not None:
+                results[symbol] = cached
+            elif normalized:
+                pending.setdefault(normalized, []).append(symbol)
+        
+        if pending:
+            for normalized, data in self._fetch_batch_quotes(list(pending)).items():
+                if normalized not in pending:
+                    continue
+                self._cache_put(self._cache, normalized, data, self._cache_duration)
+                for symbol in pending.pop(normalized):
+                    results[symbol] = data
+        
+        # Anything the batch endpoints missed goes through the per-symbol fallback chain
+        remaining = [symbol for symbol in symbols if symbol not in results]
+        if remaining:
+            pool = self._get_executor()
+            futures = {pool.submit(self.get_stock_data, symbol, refresh): symbol for symbol in remaining}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    results[symbol] = {
+                        'instrument': symbol,
+                        'error': str(e),
+                        'status': 'error'
+                    }
         
         return results
     
+    async def aget_stock_data(self, symbol):
+        """Async variant of get_stock_data; the blocking fetch runs off the event loop"""
+        return await asyncio.to_thread(self.get_stock_data, symbol)
+    
+    async def aget_multiple_quotes(self, symbols):
+        """Async variant of get_multiple_quotes, keeping its cache-first batching"""
+        return await asyncio.to_thread(self.get_multiple_quotes, symbols)
+    
+    def start_warmer(self, symbols, interval=45):
+        """Keep quotes for the given symbols warm by refetching them every `interval` seconds
+        (shorter than the 60 s quote TTL so entries are replaced before they expire).
+
+        Only one process per host runs the warmer; the others read its quotes from the
+        shared disk cache. With the disk cache disabled (or no flock, e.g. on Windows)
+        every worker warms its own cache, multiplying upstream quote traffic.
+        """
+        symbols = [s.upper().strip() for s in symbols if s and s.strip()]
+        if not symbols or (self._warm_thread and self._warm_thread.is_alive()):
+            return
+        if not self._claim_warmer():
+            logger.info("Market data warmer already running in another worker")
+            return
+        self._warm_stop.clear()
+        self._warm_thread = threading.Thread(
+            target=self._warm_loop, args=(symbols, interval), name="market-data-warmer", daemon=True
+        )
+        self._warm_thread.start()
+        logger.info("Market data warmer started for %s every %ss", ", ".join(symbols), interval)
+    
+    def _claim_warmer(self):
+        """Take the host-wide warmer lock next to the disk cache; held until the process exits"""
+        if self._warm_lock_file is not None:
+            return True
+        if fcntl is None or self._disk_cache is None:
+            return True
+        try:
+            lock_file = open(os.path.join(self._cache_dir, "warmer.lock"), "w")
+        except OSError as e:
+            logger.warning("⚠️  Could not open warmer lock, warming in this worker: %s", e)
+            return True
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._warm_lock_file = lock_file
+        return True
+    
+    def stop_warmer(self):
+        """Stop the background quote warmer, if running"""
+        self._warm_stop.set()
+    
+    def _warm_loop(self, symbols, interval):
+        while not self._warm_stop.is_set():
+            try:
+                self.get_multiple_quotes(symbols, refresh=True)
+            except Exception as e:
+                logger.warning("⚠️  Market data warm-up failed: %s", e)
+            self._warm_stop.wait(interval)
+    
     def clear_cache(self):
         """Clear the cache - useful for testing"""
-        self._cache.clear()
-        print("Market data cache cleared")
+        with self._cache_lock:
+            self._cache.clear()
+            self._history_cache.clear()
+            self._scrape_cache.clear()
+            self._metadata_cache.clear()
+            self._trends_cache.clear()
+            self._holders_cache.clear()
+            self._tickers.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+        logger.info("Market data cache cleared")
     
     def get_cache_info(self):
         """Get information about cached data"""
+        now = time.time()
+        with self._cache_lock:
+            keys = [key for key, (_, expires_at) in self._cache.items() if expires_at > now]
+            history_size = len(self._history_cache)
         return {
-            'cached_symbols': list(self._cache.keys()),
-            'cache_size': len(self._cache),
-            'cache_duration_seconds': self._cache_duration
+            'cached_symbols': keys,
+            'cache_size': len(keys),
+            'history_cache_size': history_size,
+            'cache_duration_seconds': self._cache_duration,
+            'history_cache_duration_seconds': HISTORY_CACHE_TTL
         }
 
     def get_price_history(self, symbol, days=30):
         """Fetch historical price data for trend charts."""
         symbol = symbol.upper().strip()
         
+        cache_key = f"{symbol}_{days}"
+        cached = self._cache_get(self._history_cache, cache_key)
+        if cached is not None:
+            logger.debug("✅ Using cached history for %s", symbol)
+            return cached
+        
+        try:
+            history = self._fetch_price_history(symbol, days)
+        except RateLimitExceeded as e:
+            # The shared budget is spent; later providers would only queue again
+            logger.warning("⚠️  History for %s shed: %s", symbol, e)
+            history = None
+        if history:
+            self._cache_put(self._history_cache, cache_key, history, HISTORY_CACHE_TTL)
+            return history
+        
+        return self._generate_history(symbol, days)
+    
+    def _fetch_price_history(self, symbol, days):
+        """Fetch real daily history from the first provider that answers, or None"""
         # Try Alpha Vantage TIME_SERIES_DAILY
         if self.alpha_vantage_key:
             try:
-                print(f"🔍 Fetching {symbol} history from Alpha Vantage...")
+                logger.debug("🔍 Fetching %s history from Alpha Vantage...", symbol)
                 url = "https://www.alphavantage.co/query"
                 params = {
                     'function': 'TIME_SERIES_DAILY',
                     'symbol': symbol,
                     'apikey': self.alpha_vantage_key
                 }
-                response = requests.get(url, params=params, timeout=15)
-                data = response.json()
+                response = self._paced(self._http.get, url, params=params, timeout=15)
+                data = orjson.loads(response.content)
                 
                 time_series = data.get('Time Series (Daily)', {})
                 if time_series:
-                    history = []
-                    # Get last N days
-                    sorted_dates = sorted(time_series.keys(), reverse=True)[:days]
-                    for date in sorted_dates:
-                        day_data = time_series[date]
-                        history.append({
+                    # Get last N days, oldest first (the date shift preserves order)
+                    dates = sorted(time_series)[-days:]
+                    closes = self._apply_simulation_prices(symbol, [float(time_series[d].get('4. close', 0)) for d in dates])
+                    return [
+                        {
                             "date": self._apply_time_shift(date),
-                            "price": self._apply_simulation_price(symbol, float(day_data.get('4. close', 0))),
-                            "volume": float(day_data.get('5. volume', 0))
-                        })
-                    return sorted(history, key=lambda x: x['date'])
+                            "price": price,
+                            "volume": float(time_series[date].get('5. volume', 0))
+                        }
+                        for date, price in zip(dates, closes.tolist())
+                    ]
+            except RateLimitExceeded:
+                raise
             except Exception as e:
-                print(f"⚠️  AV History failed for {symbol}: {e}")
+                logger.warning("⚠️  AV History failed for %s: %s", symbol, e)
 
         # Try FMP Historical Price
         if self.fmp_key:
             try:
-                print(f"🔍 Fetching {symbol} history from FMP...")
+                logger.debug("🔍 Fetching %s history from FMP...", symbol)
                 url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{symbol}"
                 params = {'apikey': self.fmp_key}
-                response = requests.get(url, params=params, timeout=15)
-                data = response.json()
+                response = self._paced(self._http.get, url, params=params, timeout=15)
+                data = orjson.loads(response.content)
                 
                 historical = data.get('historical', [])
                 if historical:
-                    history = []
-                    for day in historical[:days]:
-                        history.append({
+                    # FMP lists newest first
+                    recent = historical[:days][::-1]
+                    closes = self._apply_simulation_prices(symbol, [float(day.get('close', 0)) for day in recent])
+                    return [
+                        {
                             "date": self._apply_time_shift(day.get('date')),
-                            "price": self._apply_simulation_price(symbol, float(day.get('close', 0))),
+                            "price": price,
                             "volume": float(day.get('volume', 0))
-                        })
-                    return sorted(history, key=lambda x: x['date'])
+                        }
+                        for day, price in zip(recent, closes.tolist())
+                    ]
+            except RateLimitExceeded:
+                raise
             except Exception as e:
-                print(f"⚠️  FMP History failed for {symbol}: {e}")
+                logger.warning("⚠️  FMP History failed for %s: %s", symbol, e)
 
         # Try yfinance as the primary reliable source
         try:
-            print(f"🔍 Fetching {symbol} history from yfinance...")
-            import yfinance as yf
-            df = yf.download(symbol, period=f"{days}d", progress=False)
+            logger.debug("🔍 Fetching %s history from yfinance...", symbol)
+            df = self._paced(yf.download, symbol, period=f"{days}d", progress=False)
             
             if not df.empty:
-                history = []
-                for date, row in df.iterrows():
-                    history.append({
-                        "date": self._apply_time_shift(date.strftime('%Y-%m-%d')),
-                        "price": self._apply_simulation_price(symbol, float(row['Close'])),
-                        "volume": float(row['Volume'])
-                    })
-                return history
+                return self._history_from_frame(symbol, df)
+        except RateLimitExceeded:
+            raise
         except Exception as e:
-            print(f"⚠️  yfinance History failed for {symbol}: {e}")
-
-        # Fallback: Mock some trend data if all fail (better than empty chart)
-        print(f"⚠️  Using generated history for {symbol}")
-        history = []
+            logger.warning("⚠️  yfinance History failed for %s: %s", symbol, e)
+        
+        return None
+    
+    def _history_from_frame(self, symbol, df):
+        """Convert a yfinance OHLCV frame into history rows"""
+        df = df.dropna(subset=['Close'])
+        dates = [self._apply_time_shift(date) for date in df.index.strftime('%Y-%m-%d')]
+        closes = self._apply_simulation_prices(symbol, df['Close'].to_numpy(dtype=float).ravel())
+        volumes = df['Volume'].to_numpy(dtype=float).ravel()
+        return [
+            {"date": date, "price": price, "volume": volume}
+            for date, price, volume in zip(dates, closes.tolist(), volumes.tolist())
+        ]
+    
+    def _generate_history(self, symbol, days):
+        """Fallback: Mock some trend data if all sources fail (better than empty chart)"""
+        logger.warning("⚠️  Using generated history for %s", symbol)
+        rng = np.random.default_rng()
         base_price = 150.0 # Just a placeholder
-        for i in range(days):
-            date = (datetime.now() - timedelta(days=days-i)).strftime('%Y-%m-%d')
-            date = self._apply_time_shift(date)
-            # Add some random walk
-            import random
-            base_price = base_price * (1 + random.uniform(-0.02, 0.02))
-            history.append({
-                "date": date,
-                "price": round(base_price, 2),
-                "volume": random.randint(1000000, 5000000)
-            })
-        return history
+        # Add some random walk
+        prices = (base_price * np.cumprod(1 + rng.uniform(-0.02, 0.02, days))).round(2).tolist()
+        volumes = rng.integers(1000000, 5000000, days, endpoint=True).tolist()
+        today = datetime.now()
+        dates = [self._apply_time_shift((today - timedelta(days=days - i)).strftime('%Y-%m-%d')) for i in range(days)]
+        return [
+            {"date": date, "price": price, "volume": volume}
+            for date, price, volume in zip(dates, prices, volumes)
+        ]
 
     def get_market_trends(self, symbol):
         """Analyze market trends using yfinance moving averages and price momentum."""
+        symbol = symbol.upper().strip()
+        cached = self._cache_get(self._trends_cache, symbol)
+        if cached is not None:
+            logger.debug("✅ Using cached trends for %s", symbol)
+            return cached
+        
+        trends = self._fetch_market_trends(symbol)
+        # Don't pin upstream failures for the whole TTL
+        if trends.get("status") == "success":
+            self._cache_put(self._trends_cache, symbol, trends, TRENDS_CACHE_TTL)
+        return trends
+    
+    def _fetch_market_trends(self, symbol):
+        """Compute trends from 60 days of yfinance closes, or from a scraped price if that fails"""
         try:
-            print(f"🔍 Fetching {symbol} trends from yfinance...")
-            import yfinance as yf
-            df = yf.download(symbol, period="60d", progress=False)
+            logger.debug("🔍 Fetching %s trends from yfinance...", symbol)
+            df = self._paced(yf.download, symbol, period="60d", progress=False)
             
             if df is None or df.empty:
                 # Try fallback immediately
                 raise Exception("Empty data from yfinance download")
                 
-            prices = df['Close'].tolist()
-            current_raw_price = float(prices[-1])
+            closes = df['Close'].to_numpy(dtype=float).ravel()
+            current_raw_price = float(closes[-1])
             current_price = self._apply_simulation_price(symbol, current_raw_price)
             
-            ma5_raw = sum(prices[-5:]) / 5
-            ma20_raw = sum(prices[-20:]) / 20 if len(prices) >= 20 else sum(prices) / len(prices)
+            ma5_raw = float(closes[-5:].mean())
+            ma20_raw = float(closes[-20:].mean())
             
             ma5 = self._apply_simulation_price(symbol, ma5_raw)
             ma20 = self._apply_simulation_price(symbol, ma20_raw)
             
             trend = "Bullish" if ma5 > ma20 else "Neutral"
-            start_price = self._apply_simulation_price(symbol, prices[0])
+            start_price = self._apply_simulation_price(symbol, float(closes[0]))
             momentum = ((current_price - start_price) / start_price) * 100
             
             return {
                 "symbol": symbol,
                 "current_price": current_price,
-                "ma5": round(ma5, 2),
-                "ma20": round(ma20, 2),
+                "ma5": ma5,
+                "ma20": ma20,
                 "trend": trend,
                 "momentum_pct": round(momentum, 2),
                 "period": f"{len(df)} days",
@@ -651,32 +1089,31 @@ class MarketDataService:
                 "source": "yfinance",
                 "last_updated": self._apply_time_shift(datetime.now().strftime('%Y-%m-%d'))
             }
+        except RateLimitExceeded as e:
+            # Don't queue again for the scraper; report a neutral, uncached result
+            logger.warning("⚠️  Trends for %s shed: %s", symbol, e)
+            return {"symbol": symbol, "trend": "Neutral", "error": str(e), "status": "error"}
         except Exception as e:
-            print(f"⚠️  yfinance Trends failed for {symbol}: {e}")
+            logger.warning("⚠️  yfinance Trends failed for %s: %s", symbol, e)
             # Try scraper fallback
             try:
-                print(f"🔍 Falling back to scraper for {symbol} trends...")
+                logger.debug("🔍 Falling back to scraper for %s trends...", symbol)
                 # We already have a get_stock_data which uses _fetch_yahoo
                 # But for trends, we need historical points. 
                 # If we can't get history, we'll generate it based on current price to keep the app running.
-                stock_data = self._fetch_yahoo(symbol)
+                stock_data = self._paced(self._fetch_yahoo, symbol, retries=0)
                 current_price = stock_data['data']['info']['currentPrice']
                 
-                # Mock a trend based on the real scraped price
-                history = []
-                base_price = current_price / 1.1 # Assume it rose 10%
-                for i in range(30):
-                    date = (datetime.now() - timedelta(days=30-i)).strftime('%Y-%m-%d')
-                    import random
-                    base_price = base_price * (1 + random.uniform(-0.01, 0.015))
-                    history.append({
-                        "date": self._apply_time_shift(date),
-                        "price": round(base_price, 2),
-                        "volume": random.randint(1000000, 5000000)
-                    })
+                # Mock a trend based on the real scraped price: 30-day random walk from 10% below
+                prices = np.empty(30)
+                prices[0] = current_price / 1.1 # Assume it rose 10%
+                prices[1:] = 1 + np.random.default_rng().uniform(-0.01, 0.015, 29)
+                np.cumprod(prices, out=prices)
+                prices = prices.round(2)
                 
-                ma5 = sum([h['price'] for h in history[-5:]]) / 5
-                ma20 = sum([h['price'] for h in history[-20:]]) / 20
+                ma5 = float(prices[-5:].mean())
+                ma20 = float(prices[-20:].mean())
+                start_price = float(prices[0])
                 
                 return {
                     "symbol": symbol,
@@ -684,16 +1121,48 @@ class MarketDataService:
                     "ma5": round(ma5, 2),
                     "ma20": round(ma20, 2),
                     "trend": "Bullish" if ma5 > ma20 else "Neutral",
-                    "momentum_pct": round(((current_price - history[0]['price']) / history[0]['price']) * 100, 2),
+                    "momentum_pct": round(((current_price - start_price) / start_price) * 100, 2),
                     "period": "30 days (scraped/simulated)",
                     "status": "success",
                     "source": "yahoo_scraped_simulation",
                     "last_updated": self._apply_time_shift(datetime.now().strftime('%Y-%m-%d'))
                 }
             except Exception as se:
-                print(f"❌ Scraper fallback also failed: {se}")
+                logger.error("❌ Scraper fallback also failed: %s", se)
                 return {"error": str(e), "status": "error"}
 
+    def _get_ticker(self, symbol):
+        """Shared yf.Ticker for a symbol. yfinance memoizes what a Ticker has fetched,
+        so one is replaced once it is older than HOLDERS_CACHE_TTL."""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._tickers.get(symbol)
+            if entry is None or now - entry[1] > HOLDERS_CACHE_TTL:
+                entry = self._tickers[symbol] = (yf.Ticker(symbol, session=_yf_session), now)
+                while len(self._tickers) > MAX_CACHE_ENTRIES:
+                    del self._tickers[next(iter(self._tickers))]
+            return entry[0]
+    
+    def get_institutional_holders(self, symbol):
+        """Largest institutional holders as [{holder, shares, value}], cached for HOLDERS_CACHE_TTL"""
+        symbol = symbol.upper().strip()
+        cached = self._cache_get(self._holders_cache, symbol)
+        if cached is not None:
+            return cached
+        
+        holders = call_with_backoff("yfinance", lambda: self._get_ticker(symbol).institutional_holders)
+        records = []
+        if holders is not None and not holders.empty:
+            top = (
+                holders.head(HOLDERS_TOP_N)
+                .reindex(columns=_HOLDER_COLUMNS)
+                .fillna({'Holder': 'Unknown', 'Shares': 0, 'Value': 0})
+                .astype({'Holder': str, 'Shares': 'int64', 'Value': 'float64'})
+            )
+            records = top.rename(columns=str.lower).to_dict('records')
+        self._cache_put(self._holders_cache, symbol, records, HOLDERS_CACHE_TTL)
+        return records
+
 # Create a singleton instance
 market_data_service = MarketDataService()
 
@@ -1,22 +1,230 @@
 # app/tools/news_data_tool.py
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google.cloud import secretmanager
-import json
-from datetime import datetime, timedelta
+import atexit
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from app.adk.rate_limiter import RateLimitExceeded, call_with_backoff
+
+# Secrets rotate rarely; cache them so repeated tool calls skip the RPC
+SECRET_CACHE_TTL = 900
+
+_secret_cache = {}  # (project_id, secret_name) -> (value, expires_at)
+_secret_lock = threading.Lock()
+_sm_client = None
+
+def _get_secret_client():
+    """Create the Secret Manager client once per process."""
+    global _sm_client
+    with _secret_lock:
+        if _sm_client is None:
+            _sm_client = secretmanager.SecretManagerServiceClient()
+        return _sm_client
 
 def get_secret(secret_name, project_id):
     """Retrieve secret from Secret Manager."""
+    key = (project_id, secret_name)
+    with _secret_lock:
+        entry = _secret_cache.get(key)
+    if entry and entry[1] > time.time():
+        return entry[0]
+    
     try:
-        client = secretmanager.SecretManagerServiceClient()
+        client = _get_secret_client()
         name = f"projects/{project_id}/secrets/{secret_name}/versions/latest"
         response = client.access_secret_version(name=name)
-        return response.payload.data.decode("UTF-8")
+        value = response.payload.data.decode("UTF-8")
     except Exception as e:
         print(f"Error retrieving secret {secret_name}: {e}")
         return None
+    
+    with _secret_lock:
+        _secret_cache[key] = (value, time.time() + SECRET_CACHE_TTL)
+    return value
+
+_session = requests.Session()
+
+# Per-request timeout (seconds) for both news providers
+NEWS_HTTP_TIMEOUT = 10
+
+# FMP is a hedge: it is only asked once Alpha Vantage has failed or is still
+# pending after this many seconds, so quick AV answers don't spend FMP quota
+NEWS_HEDGE_DELAY = 1.5
+
+# Runs the Alpha Vantage request, and the FMP hedge when it fires
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="news")
+
+def _news_retry():
+    """Retry transient gateway errors with a short backoff; the final response is returned as-is."""
+    return Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    )
+
+def configure_session(pool_connections=10, pool_maxsize=10, keepalive=True):
+    """Replace the pooled HTTP session shared by all news_data_tool calls."""
+    global _session
+    previous = _session
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=_news_retry(),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keepalive:
+        session.headers["Connection"] = "close"
+    _session = session
+    if previous is not None:
+        previous.close()
+    return session
+
+def _close_session():
+    if _session is not None:
+        _session.close()
+
+configure_session()
+atexit.register(_close_session)
+
+# Short-lived response cache keyed by (ticker, days); entries past their TTL are
+# kept as stale-if-error fallbacks until evicted
+NEWS_CACHE_TTL = 120
+NEWS_CACHE_MAX_ENTRIES = 256
+
+_news_cache = {}  # (clean_query, days) -> (expires_at, result)
+_news_inflight = {}  # (clean_query, days) -> threading.Event
+_news_lock = threading.Lock()
+
+# Normalized article fields, and the (source key, default) each provider maps onto them
+ARTICLE_FIELDS = ("title", "summary", "source", "url", "published", "sentiment")
+AV_ARTICLE_KEYS = (
+    ("title", ""), ("summary", ""), ("source", ""), ("url", ""),
+    ("time_published", ""), ("overall_sentiment_score", 0),
+)
+# FMP doesn't provide sentiment in the stock_news endpoint, so it always defaults to 0
+FMP_ARTICLE_KEYS = (
+    ("title", ""), ("text", ""), ("site", ""), ("url", ""),
+    ("publishedDate", ""), ("sentiment", 0),
+)
+
+def _project(article, keys):
+    """Map a provider article onto ARTICLE_FIELDS."""
+    return dict(zip(ARTICLE_FIELDS, [article.get(key, default) for key, default in keys]))
+
+def _call_av(query, clean_query, days, api_key):
+    """Fetch and normalize Alpha Vantage NEWS_SENTIMENT articles."""
+    url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={clean_query}&apikey={api_key}"
+    
+    print(f"   📰 News API Query: {clean_query}")
+    try:
+        response = _session.get(url, timeout=NEWS_HTTP_TIMEOUT)
+        response.raise_for_status()
+        av_data = orjson.loads(response.content)
+    except Exception as e:
+        return {"query": query, "error": str(e), "status": "error"}
+    
+    # Handle API error messages in JSON
+    if "ErrorMessage" in av_data:
+        return {"error": av_data["ErrorMessage"], "status": "error"}
+    
+    if "Note" in av_data and "rate limit" in av_data["Note"].lower():
+        return {"error": "Alpha Vantage rate limit reached", "status": "error"}
+    
+    if 'feed' not in av_data:
+        return {"status": "empty"}
+    
+    processed_news = [_project(article, AV_ARTICLE_KEYS) for article in av_data['feed'][:10]]  # Limit to 10 articles
+    
+    return {
+        "query": query,
+        "days": days,
+        "articles": processed_news,
+        "status": "success"
+    }
+
+def _call_fmp(query, clean_query, fmp_key):
+    """Fetch and normalize FMP stock news; returns None when FMP has nothing."""
+    fmp_url = f"https://financialmodelingprep.com/api/v3/stock_news?tickers={clean_query}&limit=10&apikey={fmp_key}"
+    fmp_response = _session.get(fmp_url, timeout=NEWS_HTTP_TIMEOUT)
+    if not fmp_response.ok:
+        return None
+    fmp_data = orjson.loads(fmp_response.content)
+    if not isinstance(fmp_data, list) or len(fmp_data) == 0:
+        return None
+    
+    processed_news = [_project(article, FMP_ARTICLE_KEYS) for article in fmp_data]
+    print(f"   🔄 FMP News fallback available for {clean_query}")
+    return {
+        "query": query,
+        "articles": processed_news,
+        "status": "success",
+        "source": "FMP"
+    }
+
+_STRIP_PARENS = str.maketrans("", "", "()")
+
+def _clean_query(query):
+    """Reduce a free-form query like "NVDA (Nvidia)" to its leading ticker."""
+    return query.translate(_STRIP_PARENS).split(" ", 1)[0]
 
 def news_data_tool(query, days=7, project_id="sdr-agent-486508"):
     """Tool for retrieving financial news with environment fallbacks."""
+    # Clean query for better results
+    clean_query = _clean_query(query)
+    key = (clean_query, days)
+    
+    # Single-flight: one thread fetches a given ticker while the others wait for its result
+    while True:
+        with _news_lock:
+            entry = _news_cache.get(key)
+            if entry and entry[0] > time.time():
+                return _for_query(entry[1], query)
+            event = _news_inflight.get(key)
+            leader = event is None
+            if leader:
+                event = _news_inflight[key] = threading.Event()
+        if leader:
+            break
+        event.wait(timeout=30)
+    
+    try:
+        result = _fetch_news(query, clean_query, days, project_id)
+        with _news_lock:
+            if result.get("status") == "success":
+                _news_cache.pop(key, None)
+                _news_cache[key] = (time.time() + NEWS_CACHE_TTL, result)
+                while len(_news_cache) > NEWS_CACHE_MAX_ENTRIES:
+                    del _news_cache[next(iter(_news_cache))]
+            elif entry:
+                # Stale-if-error: older articles beat an error for the agents
+                print(f"   ⚠️ Serving cached news for {clean_query}: {result.get('error')}")
+                return _for_query(entry[1], query)
+        return result
+    finally:
+        with _news_lock:
+            _news_inflight.pop(key, None)
+        event.set()
+
+def _for_query(result, query):
+    """Cached results are shared across raw queries with the same ticker."""
+    return dict(result, query=query) if "query" in result else result
+
+def _av_result(future, query):
+    """Result of a finished Alpha Vantage future, with a shed call reported as an error."""
+    try:
+        return future.result()
+    except RateLimitExceeded as e:
+        return {"query": query, "error": str(e), "status": "error"}
+
+def _fetch_news(query, clean_query, days, project_id):
+    """Uncached news lookup: Alpha Vantage first, FMP hedged in after NEWS_HEDGE_DELAY."""
     try:
         import os
         # 1. Try environment variable first (preferred for local development)
@@ -29,70 +237,41 @@ def news_data_tool(query, days=7, project_id="sdr-agent-486508"):
         if not api_key:
             return {"error": "Alpha Vantage API key not found in env or Secret Manager", "status": "error"}
             
-        # Clean query for better results
-        clean_query = query.replace("(", "").replace(")", "").split(" ")[0]
-        url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={clean_query}&apikey={api_key}"
-        
-        print(f"   📰 News API Query: {clean_query}")
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        av_data = response.json()
+        fmp_key = os.getenv("FMP_API_KEY")
+        # Only the Alpha Vantage request spends the "news" rate-limit budget
+        av_future = _executor.submit(call_with_backoff, "news", _call_av, query, clean_query, days, api_key)
+        av_result = None
+        pending = {av_future}
         
-        # Handle API error messages in JSON
-        if "ErrorMessage" in av_data:
-            return {"error": av_data["ErrorMessage"], "status": "error"}
+        if fmp_key:
+            done, _ = wait(pending, timeout=NEWS_HEDGE_DELAY)
+            if done:
+                av_result = _av_result(av_future, query)
+                if av_result.get("status") == "success":
+                    return av_result
+                pending = set()
+            pending.add(_executor.submit(_call_fmp, query, clean_query, fmp_key))
         
-        if "Note" in av_data and "rate limit" in av_data["Note"].lower():
-            return {"error": "Alpha Vantage rate limit reached", "status": "error"}
-
-        # Filter for recent news only
-        cutoff_date = (datetime.now() - timedelta(days=days))
+        # Take the first usable feed from whichever provider answers
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future is av_future:
+                    av_result = _av_result(future, query)
+                    if av_result.get("status") == "success":
+                        return av_result
+                    continue
+                try:
+                    fmp_result = future.result()
+                except Exception as e:
+                    print(f"   ⚠️ FMP News failed for {clean_query}: {e}")
+                    fmp_result = None
+                if fmp_result:
+                    return fmp_result
         
-        if 'feed' in av_data:
-            processed_news = []
-            for article in av_data['feed'][:10]:  # Limit to 10 articles
-                processed_news.append({
-                    "title": article.get('title', ''),
-                    "summary": article.get('summary', ''),
-                    "source": article.get('source', ''),
-                    "url": article.get('url', ''),
-                    "published": article.get('time_published', ''),
-                    "sentiment": article.get('overall_sentiment_score', 0)
-                })
-            
-            return {
-                "query": query,
-                "days": days,
-                "articles": processed_news,
-                "status": "success"
-            }
-        
-        # Fallback to FMP News if Alpha Vantage has no feed
-        fmp_key = os.getenv("FMP_API_KEY")
-        if fmp_key:
-            print(f"   🔄 Falling back to FMP News for {clean_query}...")
-            fmp_url = f"https://financialmodelingprep.com/api/v3/stock_news?tickers={clean_query}&limit=10&apikey={fmp_key}"
-            fmp_response = requests.get(fmp_url, timeout=10)
-            if fmp_response.ok:
-                fmp_data = fmp_response.json()
-                if isinstance(fmp_data, list) and len(fmp_data) > 0:
-                    processed_news = []
-                    for article in fmp_data:
-                        processed_news.append({
-                            "title": article.get('title', ''),
-                            "summary": article.get('text', ''),
-                            "source": article.get('site', ''),
-                            "url": article.get('url', ''),
-                            "published": article.get('publishedDate', ''),
-                            "sentiment": 0  # FMP doesn't provide sentiment in this endpoint
-                        })
-                    return {
-                        "query": query,
-                        "articles": processed_news,
-                        "status": "success",
-                        "source": "FMP"
-                    }
-
+        # Surface the Alpha Vantage error (e.g. rate limit) when it had one
+        if av_result and av_result.get("error"):
+            return av_result
         return {"error": "No news data found in any source", "status": "error"}
         
     except Exception as e:
@@ -20,22 +20,20 @@ def cleanup_failed_hypotheses():
         
         print(f"🧹 Scanning database for failed hypotheses...")
         
-        # Find all hypotheses where title or thesis contains "Error running"
-        failed = db.query(TradingHypothesis).filter(
+        # Delete every hypothesis where title or thesis contains "Error running" in one
+        # statement; child rows go with them through the ON DELETE CASCADE foreign keys
+        deleted = db.query(TradingHypothesis).filter(
             (TradingHypothesis.title.like("%Error running%")) | 
             (TradingHypothesis.thesis.like("%Error running%"))
-        ).all()
+        ).delete(synchronize_session=False)
         
-        if not failed:
+        if not deleted:
+            db.rollback()
             print("✅ No failed hypotheses found.")
             return
 
-        print(f"🗑️  Found {len(failed)} failed hypotheses. Deleting...")
-        for hyp in failed:
-            print(f"   - Deleting ID {hyp.id}: {hyp.title[:50]}...")
-            db.delete(hyp)
-        
         db.commit()
+        print(f"🗑️  Deleted {deleted} failed hypotheses.")
         print("✅ Cleanup complete.")
         
     except Exception as e:
@@ -1,10 +1,18 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import importlib.util
 import json
 
+# lxml's C parser when installed, otherwise the stdlib one
+PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Only build nodes for the tags inspected below (price streamers, qsp-price span, headings)
+QUOTE_TAGS = SoupStrainer(["fin-streamer", "span", "h1"])
+
 def debug_parse():
     try:
-        html = open('debug_yahoo.html', 'r', encoding='utf-8').read()
-        soup = BeautifulSoup(html, 'html.parser')
+        # Hand the parser the raw bytes; no decoded copy of the page is kept around
+        with open('debug_yahoo.html', 'rb') as fp:
+            soup = BeautifulSoup(fp, PARSER, parse_only=QUOTE_TAGS, from_encoding='utf-8')
         
         # 1. Price element
         print("--- fin-streamer regularMarketPrice elements ---")
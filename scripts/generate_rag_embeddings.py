@@ -1,6 +1,8 @@
 # scripts/generate_rag_embeddings.py
 import os
 import sys
+import threading
+import numpy as np
 from sqlalchemy import text
 import vertexai
 from vertexai.language_models import TextEmbeddingModel
@@ -9,13 +11,74 @@ from vertexai.language_models import TextEmbeddingModel
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+# text-embedding-004 accepts up to 250 inputs per request; keep batches small enough
+# to stay under the per-request token limit for long documents
+EMBEDDING_BATCH_SIZE = 20
+
+PROJECT_ID = "sdr-agent-486508"
+REGION = "us-central1"
+EMBEDDING_MODEL = "text-embedding-004"
+
+_model = None
+_model_lock = threading.Lock()
+
+def _get_model():
+    """Initialize Vertex AI and load the embedding model once per process."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            vertexai.init(project=PROJECT_ID, location=REGION)
+            _model = TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL)
+        return _model
+
+def _pending_batches(conn, size):
+    """Yield (id, content) batches of un-embedded documents in id order.
+
+    Keyset pagination keeps only one batch of document text in memory and,
+    unlike a server-side cursor, survives the per-batch commits.
+    """
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            text(
+                "SELECT id, content FROM documents "
+                "WHERE embedding IS NULL AND id > :last_id ORDER BY id LIMIT :size"
+            ),
+            {"last_id": last_id, "size": size},
+        ).fetchall()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+
+def _vector_literal(values):
+    """pgvector text literal like [1.0,2.0,...] using float32's shortest repr.
+
+    pg8000 only sends parameters as text, so there is no binary path; vector
+    columns store float4 anyway, so printing float32 loses nothing and roughly
+    halves the digits sent (and parsed server-side) versus Python floats.
+    """
+    return "[" + ",".join(map(str, np.asarray(values, dtype=np.float32))) + "]"
+
+def _update_embeddings(conn, batch, embeddings):
+    """Write one batch of embeddings with a single UPDATE ... FROM (VALUES ...)"""
+    values = []
+    params = {}
+    for i, ((doc_id, _), embedding) in enumerate(zip(batch, embeddings)):
+        values.append(f"(:id{i}, CAST(:emb{i} AS vector))")
+        params[f"id{i}"] = doc_id
+        params[f"emb{i}"] = _vector_literal(embedding.values)
+    
+    update_sql = (
+        "UPDATE documents SET embedding = v.emb "
+        f"FROM (VALUES {', '.join(values)}) AS v(id, emb) "
+        "WHERE documents.id = v.id"
+    )
+    conn.execute(text(update_sql), params)
+
 def generate_embeddings():
     print("🧠 Generating embeddings for RAG documents...")
     
-    # Configuration
-    PROJECT_ID = "sdr-agent-486508"
-    REGION = "us-central1"
-    
     # Unset local DB_HOST to ensure Connector is used
     if "DB_HOST" in os.environ:
         del os.environ["DB_HOST"]
@@ -24,42 +87,39 @@ def generate_embeddings():
     
     os.environ["USE_CLOUD_SQL"] = "true"
     
-    # Initialize Vertex AI
-    vertexai.init(project=PROJECT_ID, location=REGION)
-    model = TextEmbeddingModel.from_pretrained("text-embedding-004")
+    # Reuses the initialized client and model across calls
+    model = _get_model()
     
     from app.database.database import engine
+    from scripts.init_rag_db import create_vector_index
     
     try:
         with engine.connect() as conn:
-            # Get documents without embeddings
-            result = conn.execute(text("SELECT id, content FROM documents WHERE embedding IS NULL"))
-            docs = result.fetchall()
+            # Count documents without embeddings; rows are then read one batch at a time
+            pending = conn.execute(text("SELECT count(*) FROM documents WHERE embedding IS NULL")).scalar()
             
-            if not docs:
+            if not pending:
                 print("✅ All documents already have embeddings.")
-                return
+            else:
+                print(f"📊 Found {pending} documents to process.")
             
-            print(f"📊 Found {len(docs)} documents to process.")
-            
-            for doc_id, content in docs:
-                print(f"   Processing document {doc_id}...")
-                
-                # Generate embedding
-                embedding = model.get_embeddings([content])[0].values
+            for batch in _pending_batches(conn, EMBEDDING_BATCH_SIZE):
+                print(f"   Processing documents {batch[0][0]}..{batch[-1][0]} ({len(batch)})...")
                 
-                # Update database
-                # pg8000 and SQLAlchemy text require a string representation like [1.0, 2.0, ...]
-                embedding_str = str(list(embedding))
+                # Generate embeddings for the whole batch in one request
+                embeddings = model.get_embeddings([content for _, content in batch])
                 
-                update_sql = "UPDATE documents SET embedding = :emb WHERE id = :id"
-                conn.execute(text(update_sql), {"emb": embedding_str, "id": doc_id})
+                # Update database, one statement and one commit per batch
+                _update_embeddings(conn, batch, embeddings)
                 conn.commit()
-                print(f"   ✅ Updated document {doc_id}")
-            
-            print("\n" + "="*50)
-            print("🎉 RAG Embeddings generation complete!")
-            print("="*50)
+                print(f"   ✅ Updated {len(batch)} documents")
+        
+        # The index type depends on how many rows have embeddings, so build it now
+        create_vector_index(engine)
+        
+        print("\n" + "="*50)
+        print("🎉 RAG Embeddings generation complete!")
+        print("="*50)
             
     except Exception as e:
         print(f"❌ Error: {e}")
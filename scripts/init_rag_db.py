@@ -1,4 +1,5 @@
 # scripts/init_rag_db.py
+import math
 import os
 import sys
 from sqlalchemy import text
@@ -7,6 +8,38 @@ from sqlalchemy import text
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+# Below this many rows a sequential scan beats any ANN index; above the IVFFlat
+# limit HNSW's better recall/latency is worth its slower build
+MIN_INDEXED_DOCS = 1000
+IVFFLAT_MAX_DOCS = 100000
+
+def _vector_index_sql(doc_count):
+    """CREATE INDEX statement for the embedding column, or None when not worth it."""
+    if doc_count < MIN_INDEXED_DOCS:
+        return None
+    if doc_count < IVFFLAT_MAX_DOCS:
+        lists = max(1, int(math.sqrt(doc_count)))
+        return f"CREATE INDEX IF NOT EXISTS idx_documents_embedding ON documents USING ivfflat (embedding vector_cosine_ops) WITH (lists = {lists});"
+    return "CREATE INDEX IF NOT EXISTS idx_documents_embedding ON documents USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 100);"
+
+def create_vector_index(engine):
+    """Build the ANN index sized to the embedded corpus. Safe to re-run once documents are loaded."""
+    print("🚀 Creating vector index...")
+    try:
+        with engine.begin() as conn:
+            doc_count = conn.execute(text("SELECT count(*) FROM documents WHERE embedding IS NOT NULL")).scalar()
+            index_sql = _vector_index_sql(doc_count)
+            if index_sql is None:
+                print(f"ℹ️  Skipping vector index: {doc_count} embedded documents is below {MIN_INDEXED_DOCS}, exact scans are faster")
+                return
+            # Keep the build in memory and let Postgres parallelize it
+            conn.execute(text("SET LOCAL maintenance_work_mem = '512MB'"))
+            conn.execute(text("SET LOCAL max_parallel_maintenance_workers = 4"))
+            conn.execute(text(index_sql))
+        print("✅ Vector index created")
+    except Exception as e:
+        print(f"⚠️ Could not create vector index: {e}")
+
 def init_rag_db():
     print("🚀 Initializing RAG Database for TradeSage...")
     
@@ -23,18 +56,18 @@ def init_rag_db():
     from app.database.database import engine
     
     try:
-        # 1. Enable vector extension (New connection for each attempt to avoid transaction aborts)
+        # 1. Enable vector extension (own transaction so a failure can't abort the schema phase)
         print("🔌 Enabling pgvector extension...")
         try:
-            with engine.connect() as conn:
+            with engine.begin() as conn:
                 conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
-                conn.commit()
             print("✅ pgvector extension enabled")
         except Exception as e:
             print(f"⚠️ Could not enable pgvector: {e}")
             print("   Continuing anyway (might already exist or permission issue)")
         
-        with engine.connect() as conn:
+        # Schema phase
+        with engine.begin() as conn:
             # 2. Create documents table
             print("📋 Creating 'documents' table...")
             create_table_sql = """
@@ -51,20 +84,11 @@ def init_rag_db():
             );
             """
             conn.execute(text(create_table_sql))
-            conn.commit()
             print("✅ 'documents' table created")
-            
-            # 3. Create vector index for IVFFlat or HNSW (optional but recommended)
-            print("🚀 Creating vector index...")
-            index_sql = "CREATE INDEX IF NOT EXISTS idx_documents_embedding ON documents USING hnsw (embedding vector_cosine_ops);"
-            try:
-                conn.execute(text(index_sql))
-                conn.commit()
-                print("✅ Vector index created")
-            except Exception as e:
-                print(f"⚠️ Could not create vector index: {e}")
-            
-            # 4. Add some sample RAG data (without embeddings for now, or use zeroes)
+        
+        # Seed phase
+        with engine.begin() as conn:
+            # 3. Add some sample RAG data (without embeddings for now, or use zeroes)
             print("📝 Adding sample RAG document...")
             sample_docs = [
                 {
@@ -81,20 +105,22 @@ def init_rag_db():
                 }
             ]
             
-            for doc in sample_docs:
-                check_sql = f"SELECT count(*) FROM documents WHERE title = '{doc['title']}'"
-                if conn.execute(text(check_sql)).fetchone()[0] == 0:
-                    insert_sql = """
-                    INSERT INTO documents (title, content, instrument, source_type)
-                    VALUES (:title, :content, :instrument, :source_type)
-                    """
-                    conn.execute(text(insert_sql), doc)
-                    conn.commit()
-                    print(f"   Added: {doc['title']}")
-            
-            print("\n" + "="*50)
-            print("🎉 RAG Database initialization complete!")
-            print("="*50)
+            # One parameterized statement for all samples; titles already present are skipped
+            insert_sql = """
+            INSERT INTO documents (title, content, instrument, source_type)
+            SELECT :title, :content, :instrument, :source_type
+            WHERE NOT EXISTS (SELECT 1 FROM documents WHERE title = :title)
+            """
+            conn.execute(text(insert_sql), sample_docs)
+            print(f"   Ensured {len(sample_docs)} sample documents (existing titles skipped)")
+        
+        # 4. Vector index, sized from the embedded rows. On a fresh table this is
+        # skipped; generate_rag_embeddings builds it once documents have embeddings
+        create_vector_index(engine)
+        
+        print("\n" + "="*50)
+        print("🎉 RAG Database initialization complete!")
+        print("="*50)
             
     except Exception as e:
         print(f"❌ Error: {e}")
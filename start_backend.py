@@ -1,9 +1,25 @@
 import sys
 import os
+import importlib.util
 import uvicorn
 
 # Add current directory to path
 sys.path.append(os.getcwd())
 
 if __name__ == "__main__":
-    uvicorn.run("app.adk.main:app", host="0.0.0.0", port=8080, reload=True)
+    # DEV=1 keeps the single-process auto-reloader for local development
+    if os.getenv("DEV") == "1":
+        uvicorn.run("app.adk.main:app", host="0.0.0.0", port=8080, reload=True)
+    else:
+        # Exported so each worker sizes its DB pool for the same worker count
+        workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        uvicorn.run(
+            "app.adk.main:app",
+            host="0.0.0.0",
+            port=8080,
+            workers=workers,
+            # uvloop has no Windows build; fall back to asyncio's loop there
+            loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+            http="httptools",
+        )